@@ -1,62 +1,160 @@
-import jerelog_parser as jlog
-from jerelog_parser import VerilogModule
-import time
-import argparse
-import os
-
-class CustomHelpFormatter(
-    argparse.RawDescriptionHelpFormatter,
-    argparse.ArgumentDefaultsHelpFormatter,
-    argparse.MetavarTypeHelpFormatter):
-    pass
-
-help_text = """
-This is an example script of how to use the different hierarchy path search methods within the jerelog_parser library
-"""
-
-if __name__ == "__main__":
-
-    start_time = time.time()
-
-    default_module = "" # optional: change the default to a module you'll report on often
-
-    parser = argparse.ArgumentParser(
-        formatter_class = CustomHelpFormatter,
-        description = help_text
-    )
-    parser.add_argument("-m", "--module",       dest = "module",        type = str,  nargs = "?", default = default_module, help = "module to analyze and generate reports on")
-    parser.add_argument("-r", "--report_hier",  dest = "report_hier",   type = str,  nargs = "?", default = default_module, help = "module to search for \'-m\' defined module under")
-    parser.add_argument("-M", "--max_depth",    dest = "max_depth",     type = int,  nargs = "?", default = 0,              help = "number of levels of hierarchy you want to analyze (0 means no limit)")
-    parser.add_argument("-s", "--search_method",dest = "search_method", type = int,  nargs = "?", default = 1,              help = "select a search method: 1 = exact module type, 2 = module type contains string, 3 = instance name contains string")
-    parser.add_argument("-u", "--print_unused", dest = "print_unused",  action='store_true',                                help = "generate list of unused modules that were read in")
-    parser.add_argument("-d", "--debug_mode",   dest = "debug_mode",    action='store_true',                                help = "enable printing of non-essential debug messages, recommend running only on single file")
-
-    args            = parser.parse_args()
-    analyze_module  = str(args.module)
-    top_module      = str(args.report_hier)
-    max_depth       = int(args.max_depth)
-    search_method   = int(args.search_method)
-    print_unused    = args.print_unused
-    jlog.debug_mode = args.debug_mode # debug mode enables some prints within jerelog_parser, needs to be set to either True or False
-
-    # read in a verilog_modules.db file
-    if os.path.exists("verilog_modules.db"):
-        jlog.retrieve_verilog_modules()
-    else:
-        print(f"{jlog.color.RED}ERROR{jlog.color.RESET} : verilog_modules.db does not exist, this file is required to run this script")
-
-    if analyze_module != "" and top_module != "":
-        out_file = open(f"{analyze_module}_under_{top_module}.txt", 'w')
-
-        if search_method == 1:
-            jlog.find_all_instances(analyze_module, top_module, out_file)
-        elif search_method == 2:
-            jlog.find_all_instances_re(analyze_module, top_module, out_file)
-        elif search_method == 3:
-            jlog.find_all_instances_iname_re(analyze_module, top_module, out_file)
-        else:
-            print(f"{jlog.color.RED}ERROR{jlog.color.RESET} : invalid search method selected")
-
-    end_time = time.time()
-
-    print(f"INFO : Execution time = {end_time - start_time} seconds")
\ No newline at end of file
+import jerelog_parser as jlog
+from jerelog_parser import VerilogModule
+import time
+import argparse
+import os
+import re
+import sys
+
+class CustomHelpFormatter(
+    argparse.RawDescriptionHelpFormatter,
+    argparse.ArgumentDefaultsHelpFormatter,
+    argparse.MetavarTypeHelpFormatter):
+    pass
+
+help_text = """
+This is an example script of how to use the different hierarchy path search methods within the jerelog_parser library
+"""
+
+default_module = "" # optional: change the default to a module you'll report on often
+
+# resolve the search functions once at import so selecting a method is a single dict lookup
+search_method_dispatch = {
+    1: jlog.find_all_instances,
+    2: jlog.find_all_instances_re,
+    3: jlog.find_all_instances_iname_re,
+}
+
+# resolve the error prefix once instead of chasing jlog.color attributes per print,
+# and skip the ANSI codes entirely when stdout is piped somewhere other than a terminal
+_ERR = f"{jlog.color.RED}ERROR{jlog.color.RESET}" if sys.stdout.isatty() else "ERROR"
+
+# parser construction is not free (formatter MRO + action list), build it once and reuse
+_parser = None
+
+def build_parser():
+    """construct the argument parser for this script (cached, use via main())"""
+    parser = argparse.ArgumentParser(
+        formatter_class = CustomHelpFormatter,
+        description = help_text
+    )
+    parser.add_argument("-m", "--module",       dest = "module",        type = str,  nargs = "?", default = default_module, help = "module to analyze and generate reports on")
+    parser.add_argument("-r", "--report_hier",  dest = "report_hier",   type = str,  nargs = "?", default = default_module, help = "module to search for \'-m\' defined module under")
+    parser.add_argument("-M", "--max_depth",    dest = "max_depth",     type = int,  nargs = "?", default = 0,              help = "number of levels of hierarchy you want to analyze (0 means no limit)")
+    parser.add_argument("-s", "--search_method",dest = "search_method", type = int,  nargs = "?", default = 1,              choices = [1, 2, 3],      help = "select a search method: 1 = exact module type, 2 = module type contains string, 3 = instance name contains string")
+    parser.add_argument("-b", "--batch",        dest = "batch",         type = str,  nargs = "?",                           help = "filepath to a list of '<module>,<report_hier>' pairs to search in one run (one database load for all searches)")
+    parser.add_argument("-u", "--print_unused", dest = "print_unused",  action='store_true',                                help = "generate list of unused modules that were read in")
+    parser.add_argument("-d", "--debug_mode",   dest = "debug_mode",    action='store_true',                                help = "enable printing of non-essential debug messages, recommend running only on single file")
+    return parser
+
+class RawLineSink:
+    """
+    Minimal write-only text sink on a raw file descriptor.
+
+    Writes append to a single bytearray which is flushed with one os.write()
+    per megabyte, bypassing the TextIOWrapper -> BufferedWriter -> FileIO
+    stack (and its per-write locking/encoder dispatch) that adds up when the
+    search functions emit millions of short lines on deep hierarchies.
+    Only the write() method is needed by the find_all_instances* functions.
+    """
+    def __init__(self, path, flush_size=1<<20):
+        self.fd         = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        self.buf        = bytearray()
+        self.flush_size = flush_size
+
+    def write(self, line):
+        self.buf += line.encode('ascii') # Verilog identifiers are ASCII, so this is a straight byte copy
+        if len(self.buf) >= self.flush_size:
+            self.flush()
+
+    def writelines(self, lines):
+        self.write("".join(lines))
+
+    def flush(self):
+        if self.buf:
+            os.write(self.fd, self.buf)
+            self.buf.clear()
+
+    def close(self):
+        self.flush()
+        os.close(self.fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def run_search(analyze_module, top_module, search_method):
+    """run one instance search and write the found paths to <module>_under_<report_hier>.txt
+
+    Args:
+        analyze_module (string): module (or substring, methods 2/3) to search for
+        top_module (string): module to search under
+        search_method (int): 1 = exact module type, 2 = module type contains string, 3 = instance name contains string
+    """
+    if analyze_module != "" and top_module != "":
+        # deep hierarchies emit one short write per path found, so batch them
+        # through a raw-fd sink instead of the default text layer
+        with RawLineSink(f"{analyze_module}_under_{top_module}.txt") as out_file:
+
+            search_function = search_method_dispatch.get(search_method)
+            if search_function is None:
+                # argparse 'choices' already rejects anything outside 1-3, this is just a backstop
+                print(f"{_ERR} : invalid search method selected")
+            else:
+                if search_method in (2, 3):
+                    # compile the "contains" needle once here so the walker runs a
+                    # C-level Pattern.search per name instead of str.find per visit
+                    # (re.escape keeps the plain-substring semantics)
+                    search_function(re.compile(re.escape(analyze_module)), top_module, out_file)
+                else:
+                    search_function(analyze_module, top_module, out_file)
+
+def main(argv=None):
+    """entry point, callable repeatedly from a driver without rebuilding the parser
+
+    Args:
+        argv (list of strings, optional): arguments to parse in place of sys.argv
+    """
+    global _parser
+
+    if _parser is None:
+        _parser = build_parser()
+
+    # argparse already applied the type= converters, no need to re-box the values
+    args            = _parser.parse_args(argv)
+    analyze_module  = args.module
+    top_module      = args.report_hier
+    search_method   = args.search_method
+    jlog.debug_mode = args.debug_mode # debug mode enables some prints within jerelog_parser, needs to be set to either True or False
+
+    # read in a verilog_modules.db file (once, even in batch mode)
+    # EAFP: just attempt the load rather than paying a separate exists() stat first
+    try:
+        jlog.retrieve_verilog_modules()
+    except FileNotFoundError:
+        print(f"{_ERR} : verilog_modules.db does not exist, this file is required to run this script")
+        sys.exit(1)
+
+    if args.batch:
+        # amortize the database load across many searches instead of one process each
+        with open(args.batch, 'r') as batch_file:
+            for line in batch_file:
+                pair = line.strip()
+                if pair == "" or pair.startswith("#"):
+                    continue
+                batch_module, _, batch_top = pair.partition(",")
+                run_search(batch_module.strip(), batch_top.strip(), search_method)
+    else:
+        run_search(analyze_module, top_module, search_method)
+
+if __name__ == "__main__":
+
+    start_ns = time.perf_counter_ns() # monotonic, unaffected by NTP/wall-clock jumps
+
+    main()
+
+    end_ns = time.perf_counter_ns()
+
+    print(f"INFO : Execution time = {(end_ns - start_ns) / 1e9:.6f} seconds")
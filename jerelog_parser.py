@@ -1,1038 +1,1343 @@
-
-r"""
-Copyright (C) 2024 Analog Devices, Inc., All Rights Reserved.
-
-This module contains a library of functions designed to aide in writing Python scripts around Verilog files
-where Hierarchy knowledge is required.
-
-To use this library, it is recommended that the jerelog_parser be imported as well as the class 'VerilogModule'.
-    -This class is used as the standard format to transfer module information between functions contained in this library.
-
-This library does not require the use of a Verilog interpreter such as Icarus or Xcelium.
-
-This library contains an example script showing some basic applications of the functions contained within this library.
-"""
-
-import argparse
-import os
-import time
-import re
-import sqlite3
-import pickle
-import signal
-import math
-
-class CustomHelpFormatter(
-    argparse.RawDescriptionHelpFormatter,
-    argparse.ArgumentDefaultsHelpFormatter,
-    argparse.MetavarTypeHelpFormatter):
-    pass
-
-# help prompt, look how nice it is in Python!
-example_script_help_text = """
-INFO:
-    This script contains only a basic example of how to use functions defined
-    in this library. It is recommended that this library be imported and integrated
-    to your own scripting.
-"""
-
-class color:
-    GREY        = "\033[38;5;246m"
-    GREEN       = "\033[38;5;10m"
-    YELLOW      = "\033[38;5;220m"
-    WHITE       = "\033[38;5;255m"
-    RED         = "\033[38;5;196m"
-    RESET       = "\033[0;0m"
-    GREEN_BG    = "\033[48;5;10m\033[38;5;232m"  # bold black text on green background
-    YELLOW_BG   = "\033[48;5;220m\033[38;5;232m" # bold black text on yellow background
-    GREY_BG     = "\033[48;5;246m\033[38;5;232m" # bold black text on grey background
-    RED_BG      = "\033[48;5;196m\033[38;5;232m" # bold white text on red background
-
-class VerilogModule:
-    """
-    Custom class to hold saved attributes about a Verilog Module in
-    a format which can aide parsing throughout functions in jerelog_parser.
-
-    ATTRIBUTES:
-        name: module name
-        inputs: list of module inputs
-        outputs: list of module outputs
-        submodules: list of instances as well as their type
-
-        (useful for VS Code CTRL + Click navigation):
-        filepath: path to the file where this module is defined
-        linenum: line number on filepath where module is defined
-        startcol: column number on filepath where module is defined <points to the end of the module name>
-    """
-    def __init__(self, name, inputs, outputs, submodules, filepath, linenum, startcol):
-        self.name       = name
-        self.inputs     = inputs
-        self.outputs    = outputs
-        self.submodules = submodules
-        self.filepath   = filepath
-        self.linenum    = linenum
-        self.startcol   = startcol
-
-seperating_char = "." # use this to define what character separates the hierarchies when reporting paths.
-
-verilog_modules = []
-module_list = []
-multi_defined_list = []
-used_module_list = []
-used_file_list = []
-unused_file_list = []
-verilog_define_variables = []
-
-def read_module_info(module_name):
-    """return information about a module if it is defined
-
-    Args:
-        module_name (string): the name of the module you want to get information about
-
-    Returns:
-        name: module name
-        inputs: list of module inputs
-        outputs: list of module outputs
-        submodules: list of instances as well as their type
-
-        (useful for VS Code CTRL + Click navigation):
-        filepath: path to the file where this module is defined
-        linenum: line number on filepath where module is defined
-        startcol: column number on filepath where module is defined
-    """
-    for module in verilog_modules:
-        if module.name == module_name:
-            return {
-                "name": module.name,
-                "inputs": module.inputs,
-                "outputs": module.outputs,
-                "submodules": module.submodules,
-                "filepath": module.filepath,
-                "linenum": module.linenum,
-                "startcol": module.startcol
-            }
-
-def get_uncommented(line, block_comment):
-    """pass in a line and return the section that isn't blocked by a comment
-
-    Args:
-        line (string): raw line
-        block_commment (bool): true if line starts in an active block comment
-
-    Returns:
-        out_line (string): line without the comments
-        block_comment (bool): true if line ends in an active block comment
-    """
-    i = 0
-    out_line = ""
-
-    if not block_comment:
-        while(line.find("//*") != -1):
-            line = line.replace("//*", "//")
-
-    while i < len(line):
-        if block_comment:
-            if line[i:].find("*/") != -1:
-                # add nothing to the running string, but move the index to the end of block comment and clear the flag
-                out_line_temp = ""
-                block_comment = False
-                i = i + line[i:].find("*/") + len("*/")
-            else:
-                # add nothing more since the rest of the line is commented out
-                out_line_temp = ""
-                i = len(line)
-        else:
-            if line[i:].find("/*") != -1:
-                # add anything before the block comment and set the block_comment flag
-                out_line_temp = line[i: i + line[i:].find("/*")]
-                block_comment = True
-                i = i + line[i:].find("/*")
-            else:
-                if line[i:].find("//") != -1:
-                    # add nothing past the comment since the rest of the line is commented out
-                    out_line_temp = line[i:line[i:].find("//")]
-                    i = len(line)
-                else:
-                    # no more comments, return the rest of the line
-                    out_line_temp = line[i:]
-                    i = len(line)
-
-        out_line = out_line + out_line_temp
-
-    return out_line, block_comment
-
-def check_ifdefs(line, inside_ifdef, ifdef_stack):
-    """check for valid \`ifdefs and \`defines
-
-    Args:
-        line (string): a line with no comments.
-        inside_ifdef (bool): store if the current line exists within an \`ifdef already.
-        ifdef_stack (array of strings): stack of variables being used for \`ifdefs (pop as the \`endif is detected).
-
-    Returns:
-        filtered_line: filters out the existing line if it is blocked by ifdefs.
-        inside_ifdef (bool): PASSTHROUGH store if the current line exists within an \`ifdef already.
-        ifdef_stack (array of strings): PASSTHROUGH stack of variables being used for \`ifdefs (pop as the \`endif is detected).
-    """
-
-    global verilog_define_variables
-    temp_line = line.strip()
-    temp_line = temp_line.replace("\t", " ")
-    filtered_line = ""
-
-    # Check for `ifdef, `else, `define and `endif
-    if temp_line.startswith('`ifdef'):
-        ifdef_stack.append(temp_line.split(' ')[-1])
-        inside_ifdef = ifdef_stack[-1] in verilog_define_variables
-    elif temp_line.startswith('`protected'):
-        ifdef_stack.append('protected')
-        inside_ifdef = ifdef_stack[-1] in verilog_define_variables
-    elif temp_line.startswith('`ifndef'):
-        ifdef_stack.append(temp_line.split(' ')[-1])
-        inside_ifdef = len(ifdef_stack) == 0 and ifdef_stack[-1] not in verilog_define_variables
-    elif temp_line.startswith('`endif'):
-        ifdef_stack.pop()
-        inside_ifdef = len(ifdef_stack) > 0 and ifdef_stack[-1] in verilog_define_variables
-    elif temp_line.startswith('`endprotected'):
-        ifdef_stack.pop()
-        inside_ifdef = len(ifdef_stack) > 0 and ifdef_stack in verilog_define_variables
-    elif temp_line.startswith('`else'):
-        inside_ifdef = len(ifdef_stack) > 0 and ifdef_stack[-1] not in verilog_define_variables
-    elif temp_line.startswith('`define'):
-        if (inside_ifdef) or (len(ifdef_stack) == 0):
-            # Parse `define variables and append them to verilog_define_variables
-            tokens = temp_line.split(' ')
-            if len(tokens) >= 2:
-                verilog_define_variables.append(tokens[1])
-    else:
-        # Include the line if inside a valid `ifdef block or not inside any `ifdef
-        if inside_ifdef or len(ifdef_stack) == 0:
-            filtered_line = line
-
-    return filtered_line, inside_ifdef, ifdef_stack
-
-def get_module_name(line):
-    """Reads in a line where a module is initially defined and returns the module name
-
-    Args:
-        line (string): starts with "module " and has a module name on it
-
-    Returns:
-        string: just the module name, does not return the module IO
-    """
-    module_name = ""
-
-    start_idx = line.find("module ") + len("module ")
-
-    line = line[start_idx:].strip()
-
-    end_idx = 0
-    while(1):
-        if line[:end_idx].find(" ") != -1: break
-        elif line[:end_idx].find("\t") != -1: break
-        elif line[:end_idx].find("(") != -1: break
-        elif line[:end_idx].find(";") != -1: break
-        elif line[:end_idx].find("\n") != -1: break
-        elif end_idx == len(line):
-            end_idx = len(line) + 1
-            break
-        else: end_idx = end_idx + 1
-
-    if end_idx != -1:
-        module_name = line[:end_idx - 1]
-
-    return module_name
-
-def get_one_line_code(module_code):
-    """
-    Replace all newlines, tabs, double spaces with single space to simplify reading
-
-    Args:
-        module_code (array of strings): pass in the module
-    """
-    one_line_code = ""
-
-    for line in module_code:
-        one_line_code = one_line_code + line
-
-    one_line_code = one_line_code.replace("\n", " ")
-    one_line_code = one_line_code.replace("\t", " ")
-    one_line_code = one_line_code.replace(", ", ",")
-    one_line_code = one_line_code.replace("# (", "#(")
-
-    # skip over parameters if any
-    while 1:
-        if one_line_code.find("#(") != -1:
-            i = one_line_code.find("#(") + len("#(")
-            parenth_lvl = 1
-            while 1:
-                if one_line_code[i] == ")":
-                    parenth_lvl = parenth_lvl - 1
-                if one_line_code[i] == "(":
-                    parenth_lvl = parenth_lvl + 1
-                i = i + 1
-                if parenth_lvl == 0:
-                    # print(one_line_code[one_line_code.find("#("):i])
-                    break
-            one_line_code = one_line_code.replace(one_line_code[one_line_code.find("#("):i], "")
-        else:
-            break
-
-    # skip over event-triggered if any
-    while 1:
-        if one_line_code.find("@(") != -1:
-            i = one_line_code.find("@(") + len("@(")
-            parenth_lvl = 1
-            while 1:
-                if one_line_code[i] == ")":
-                    parenth_lvl = parenth_lvl - 1
-                if one_line_code[i] == "(":
-                    parenth_lvl = parenth_lvl + 1
-                i = i + 1
-                if parenth_lvl == 0:
-                    # print(one_line_code[one_line_code.find("@("):i])
-                    break
-            one_line_code = one_line_code.replace(one_line_code[one_line_code.find("@("):i], "")
-        else:
-            break
-
-    while(one_line_code.find("  ") != -1):
-        one_line_code = one_line_code.replace("  ", " ")
-
-    # debug that all whitespace other than a single space is removed
-    # print(one_line_code)
-    return one_line_code
-
-def get_module_type_name(type_name_string):
-    """parse an instance's instantiation for that instance's type and instance name
-
-    Args:
-        type_name_string (string): contains two words seperated by whitespace only
-
-    Returns:
-        type_string: instance's type
-        name_string: instance's name
-    """
-
-    type_string = ""
-    name_string = ""
-
-    # get rid of leading whitespace
-    type_name_string = type_name_string.strip()
-
-    type_string = type_name_string[:type_name_string.find(" ") + len(" ")]
-    name_string = type_name_string[type_name_string.find(" ") + len(" "):]
-
-    type_string = type_string.strip()
-    name_string = name_string.strip()
-
-    # if debug_mode:
-    #     print(f"sub-instance type = {type_string}, sub-instance name = {name_string}")
-
-    return type_string, name_string
-
-def parse_ports(verilog_text):
-    """get the ports of a module using regular expressions
-
-    Args:
-        verilog_text (string): pass in the single-line version of the module's code
-
-    Returns:
-        ports: a list of all ports with (in order) port direction, name, and width
-    """
-    ports = []
-    port_pattern = re.compile(r'\b(input|output|inout)\s+(?:reg|logic|bit)?\s*(?:(\[[^\]]*\])\s*)?(\w+(?:\s*,\s*\w+)*)\s*[;,)]', re.MULTILINE)
-
-    for match in port_pattern.finditer(verilog_text):
-        port_type, bit_width, port_group = match.groups()
-        port_names = [port.strip() for port in port_group.split(',')]
-
-        for port_name in port_names:
-            bit_width_formatted = bit_width.strip() if bit_width else ''
-            ports.append((port_type, port_name, bit_width_formatted))
-
-    return ports
-
-# reserved words/characters that should not be the names of instances or modules
-invalid_module_names = [
-    'if', 'else',
-    'begin', 'end',
-    'case', 'endcase',
-    'generate', 'endgenerate',
-    'initial',
-    'wire',
-    'logic',
-    'parameter',
-    'localparam',
-    'assign',
-    'always',
-    'always_ff',
-    'for',
-    '$display',
-    '$finish',
-    '@',
-]
-
-def save_module_attributes(module, one_line_module_code):
-    """retreive all information about a verilog module
-
-    Args:
-        module (string): name of the module
-        one_line_module_code (string): uncommented, single-line version of the verilog code
-
-    Returns:
-        input_list: list of all inputs to this module
-        output_list: list of all outputs to this module
-        submod_list: list of all submodules called by this module
-    """
-
-    def handle_ctrl_c(signal, frame):
-        # print("\nCtrl+C detected. Exiting gracefully...")
-        print(f"\nremaining line at exit: {one_line_module_code[i:]}")
-        exit()
-    if debug_mode:
-        print(f"{color.GREEN}INFO{color.RESET} : getting attributes for module {module} ...")
-        signal.signal(signal.SIGINT, handle_ctrl_c)
-
-    i = 0
-    input_list = []
-    output_list = []
-    submod_list = []
-
-    ports = parse_ports(one_line_module_code)
-
-    if debug_mode:
-        print(ports)
-
-    for port_type, port_name, port_width in ports:
-        if port_type == "input":
-            input_list.append([port_type, port_name, port_width])
-        if port_type == "output":
-            output_list.append([port_type, port_name, port_width])
-        if port_type == "inout":
-            input_list.append([port_type, port_name, port_width])
-            output_list.append([port_type, port_name, port_width])
-
-    while i < len(one_line_module_code):
-
-        # module definition handling
-        if one_line_module_code[i:].find("module " + module) != -1:
-            # avoid an infinite loop if the module name passed in is blank
-            # that's still an error but this avoids chasing a red-herring
-            if one_line_module_code[i:].find(";") != -1:
-                i = i + one_line_module_code[i:].find(";") + len(";")
-            else:
-                i = len(one_line_module_code)
-
-        # wire definition handling
-        elif one_line_module_code[i:].find("wire ") == 0:
-            # not keeping track of wires for now...
-            i = i + one_line_module_code[i:].find(";") + len(";")
-
-        # assignment definition handling
-        elif one_line_module_code[i:].find("assign ") == 0:
-            # not keeping track of assigns for now...
-            i = i + one_line_module_code[i:].find(";") + len(";")
-
-        elif one_line_module_code[i:].find("(") != -1:
-            submod_start = i
-            submod_end = i + one_line_module_code[i:].find("(")
-
-            # mainly to filter things like "end" or "endcase" out
-            while(1):
-                found_one = False
-                for inval_mod_name in invalid_module_names:
-                    if one_line_module_code[submod_start:submod_end].strip().startswith(inval_mod_name + " "):
-                        submod_start = submod_start + one_line_module_code[submod_start:submod_end].find(inval_mod_name + " ") + len(inval_mod_name + " ")
-                        found_one = True
-                if not found_one:
-                    break
-
-            if one_line_module_code[submod_start:submod_end].find(";") == -1:
-                inst_type, inst_name = get_module_type_name(one_line_module_code[submod_start:submod_end])
-                inst_type_name_cat = inst_type + inst_name # to simplify filtering code, save type and name into a single string to check for any special characters
-                if (
-                    # make sure the type and name aren't blank
-                    (inst_type != '') and
-                    (inst_name != '') and
-
-                    # make sure the type or name isn't a reserved word
-                    (inst_type not in invalid_module_names) and
-                    (inst_name not in invalid_module_names) and
-
-                    # neither instance name or type should have these special characters...
-                    (inst_type_name_cat.find("=") == -1) and
-                    (inst_type_name_cat.find(":") == -1) and
-                    (inst_type_name_cat.find(".") == -1) and
-                    (inst_type_name_cat.find("[") == -1) and
-                    (inst_type_name_cat.find("]") == -1) and
-                    (inst_type_name_cat.find("$") == -1) and
-                    (inst_type_name_cat.find("<") == -1) and
-                    (inst_type_name_cat.find(">") == -1) and
-                    (inst_type_name_cat.find(" ") == -1)
-                    ):
-                    submod_list.append([inst_type, inst_name])
-
-            i = i + one_line_module_code[i:].find(";") + len(";")
-
-        # avoid getting stuck in a loop if none of the above are met
-        else:
-            if one_line_module_code[i:].find(";") != -1:
-                i = i + one_line_module_code[i:].find(";") + len(";")
-            else:
-                i = len(one_line_module_code)
-
-    if debug_mode:
-        print(f"\t{color.YELLOW}INPUTS{color.RESET}        : {input_list[:len(input_list)]}")
-        print(f"\t{color.YELLOW}OUTPUTS{color.RESET}       : {output_list[:len(output_list)]}")
-        for inst_t, inst in submod_list:
-            print(f"\t{color.GREY}CALLED MODULE{color.RESET} : instance = {inst},\ttype = {inst_t}")
-
-    return input_list, output_list, submod_list
-
-def replace_env_variable(filepath):
-    """
-    Pass in a filepath with environment variables and returns the
-    same filepath with the environment varialbe replaced by that variable's value.
-
-    Args:
-        filepath (string): filepath with environment variables
-
-    Returns:
-        string: filepath where the environment variables are replaced by the value
-    """
-    # Find environment variable placeholders in the file path
-    env_var_start = filepath.find('$')
-    env_var_end = filepath.find(os.path.sep, env_var_start)
-
-    # If an environment variable placeholder is found
-    while env_var_start != -1 and env_var_end != -1:
-        # Extract the environment variable name
-        env_var_name = filepath[env_var_start + 1:env_var_end]
-
-        # Get the value of the environment variable
-        env_var_value = os.environ.get(env_var_name, '')
-
-        if debug_mode:
-            print(f"INFO : replacing ${env_var_name} with {env_var_value}")
-
-        # Replace the environment variable placeholder with its value
-        filepath = filepath[:env_var_start] + env_var_value + filepath[env_var_end:]
-
-        # Find the next environment variable placeholder
-        env_var_start = filepath.find('$')
-        env_var_end = filepath.find(os.path.sep, env_var_start)
-
-    return filepath
-
-def parse_verilog(filename):
-    """Reads in a verilog file and saves information about the modules contained within to verilog_modules
-
-    Args:
-        filename (string): path to Verilog file intended to be parsed
-    """
-
-    if filename.find("$") != -1:
-        filename = replace_env_variable(filename)
-
-    if os.path.isfile(filename):
-        print(f"{color.GREEN}INFO{color.RESET} : reading in {filename} ...")
-        file = open(filename, 'r')
-
-        active_module = False
-        block_comment = False
-        inside_ifdef = False
-        ifdef_stack = []
-        line_number = 0
-
-        module_code = []
-        ifdef_stack = []
-        global verilog_modules
-        global module_list
-        global multi_defined_list
-
-        for line in file:
-            line_number = line_number + 1
-
-            uncommented_line, block_comment = get_uncommented(line, block_comment)
-            uncommented_line, inside_ifdef, ifdef_stack = check_ifdefs(uncommented_line, inside_ifdef, ifdef_stack)
-
-            if (uncommented_line != "") or (uncommented_line != "\n"):
-
-                # debug exactly what pass through the above filters (commenting and `ifdef filters)
-                # if debug_mode:
-                #     print(uncommented_line[:len(uncommented_line) - 1])
-
-                # endmodule case
-                if uncommented_line.find("endmodule") != -1:
-                    if active_module == False:
-                        print("ERROR : endmodule detected before a 'module' definition was established")
-                        exit()
-                    if debug_mode:
-                        print(f"INFO : End of module \'{module}\' on line {str(line_number)}")
-                    active_module = False
-
-                    # module is finished here, save off the attributes and reset the module_code variable for the next module (if any)
-                    module_code.append(uncommented_line)
-                    one_line_module_code = get_one_line_code(module_code)
-                    if module not in module_list:
-                        module_list.append(module)
-                        input_list, output_list, submod_list = save_module_attributes(module, one_line_module_code)
-                        verilog_modules.append(VerilogModule(module, input_list, output_list, submod_list, filename, start_line, start_column))
-                    else:
-                        print(f"{color.YELLOW}WARNING{color.RESET} : module named {module} already defined")
-                        multi_defined_list.append([module, filename, start_line, start_column])
-                    module_code = []
-
-                # module definition case
-                elif (uncommented_line.strip().startswith("module ")) or (uncommented_line.strip().startswith("module\t")) or (uncommented_line.find(" module ") != -1):
-                    module = get_module_name(uncommented_line)
-                    start_line = line_number
-                    start_column = uncommented_line.find(module) + len(module) + 1
-                    if debug_mode:
-                        print(f"INFO : Reading in module \'{module}\' on line {str(line_number)}")
-                    active_module = True
-                    module_code.append(uncommented_line)
-
-                # between a 'module' and an 'endmodule'
-                elif active_module:
-                    module_code.append(uncommented_line)
-
-        if active_module:
-            print(f"{color.RED}ERROR{color.RESET} : module \'{module}\' did not have a corresponding endmodule")
-            exit()
-
-        file.close()
-    else:
-        print(f"ERROR : {filename} was not found")
-
-def report_on_module(module):
-    """print all saved information for a given module
-
-    Args:
-        module (string): this should be the module name (note, NOT the instance name)
-    """
-
-    top_module_info = read_module_info(module)
-
-    print("\n-------------------------------------")
-    print(f"INFO : report on module {module}...")
-    if top_module_info:
-        print(f"NAME:       {top_module_info['name']}")
-        print(f"FILEPATH:   {top_module_info['filepath']}:{top_module_info['linenum']}:{top_module_info['startcol']}")
-        print(f"INPUTS:     {top_module_info['inputs']}")
-        print(f"OUTPUTS:    {top_module_info['outputs']}")
-        print(f"INSTANCE:   {top_module_info['submodules']}")
-    else:
-        print(f"{color.RED}ERROR{color.RESET} : module {module} was not found.")
-    print("-------------------------------------\n")
-
-def report_hierarchy(top_module, hier_num=0, report_unused=False, max_depth=0):
-    """This function recursively reads in the module information and prints out a hierarchical tree.
-
-    Args:
-        top_module (string): pass in module to report hierarchy on
-        hier_num (int, optional): keeps track of how many times to indent and the current level of recursion. Default to 0.
-        report_unused (bool, optional): reports if any modules are read in but unused. Defaults to False.
-        max_depth (int, optional): if NOT set to 0, sets the number of levels below top_module you want to report.
-    """
-    top_module_info = read_module_info(top_module)
-
-    global used_module_list # keep a running list of all modules used
-    global used_file_list   # keep a running list of all files used
-    global unused_file_list # keep a running list of all files used
-    global out_file         # due to recursion, the output file must be stored as a global variable
-
-    if hier_num == 0:
-        out_file = open("hierarchy_" + top_module + ".txt", 'w')
-        if report_unused:
-            used_module_list = [top_module]
-        if max_depth != 0:
-            out_file.write(f"INFO : max_depth set to {max_depth}\n\n")
-        print(f"\nINFO : reporting hierarchy below module {top_module}...\n")
-        print(top_module)
-        out_file.write(top_module + "\n")
-
-    indent      = '| ' * (hier_num + 1)
-    file_indent = '\t' * (hier_num + 1)
-    if top_module_info:
-        if top_module_info['filepath'] not in used_file_list:
-            used_file_list.append(top_module_info['filepath'])
-        for i_type, i_name in top_module_info['submodules']:
-            print(f"{indent}{i_name} ({i_type})")
-            out_file.write(f"{file_indent}{i_name} ({i_type})\n")
-            used_module_list.append(i_type)
-            if max_depth == 0 or hier_num < max_depth - 1:
-                report_hierarchy(i_type, hier_num + 1, max_depth=max_depth)
-
-    # to avoid printing on all levels of this function which gets called recursively, only run
-    # the following code when on the highest level of hierarchy
-    # (every recursive call of this function increases the hierarchy number by one)
-    if hier_num == 0:
-        out_file.close()
-        unique_used_module_list = list(set(used_module_list))
-        if report_unused:
-            print(f"\nINFO : generating report of unused modules under {top_module}...")
-            unique_unused_module_list = []
-
-            # report all unused modules over STDOUT
-            for module in verilog_modules:
-                if module.name not in unique_used_module_list:
-                    unique_unused_module_list.append(module)
-                    print(f"\tmodule type {module.name} was unused ({module.filepath}:{module.linenum}:{module.startcol})")
-
-            # report all unused files in unused_files.txt
-            unused_log_file = open("unused_files.txt", 'w')
-            for module in unique_unused_module_list:
-                if (module.filepath not in unused_file_list) and (module.filepath not in used_file_list):
-                    unused_file_list.append(module.filepath)
-                    unused_log_file.write(f"No modules from this file were used : {module.filepath}\n")
-            unused_log_file.close()
-
-        print(f"\nINFO : end of hierarchy report")
-
-def find_all_instances(module_type, search_module, outfile, current_path=""):
-    """recursively works backwards to find all paths to a certain type of module
-
-    Args:
-        module_type (string): the module you're looking for
-        search_module (string): the module you're looking under
-        outfile (file): file where the report will be written
-        current_path (string, optional): the current path being traced backwards
-    """
-    if current_path == "":
-        print(f"{color.GREEN}INFO{color.RESET} : searching for all instances under {search_module} where the module type is '{module_type}'\n")
-    start_of_search_path = current_path # save what hierarchy you're currently on here
-    for module in verilog_modules:
-        # cycle through all sub-modules to find if a given module is found
-        for i_type, i_name in module.submodules:
-            append_path = start_of_search_path # re-initialize for each sub-module
-            if i_type == module_type:
-                if current_path == "":
-                    append_path = f"{i_name}"
-                else:
-                    append_path = f"{i_name}{seperating_char}{start_of_search_path}"
-
-                if module.name == search_module:
-                    print(f"INFO : Found path:  = {module.name}{seperating_char}{append_path}")
-                    outfile.write(f"{module.name}{seperating_char}{append_path}\n")
-                find_all_instances(module.name, search_module, outfile, current_path=append_path)
-
-def find_all_instances_re(module_type, search_module, outfile, current_path=""):
-    """recursively works backwards to find all paths to a certain type of module.
-    module_type will contain the string you're looking for in a module
-    Follows the regular find_all_instances() function after this first call.
-
-    Args:
-        module_type (string): the module you're looking for MUST contain this string
-        search_module (string): the module you're looking under
-        outfile (file): file where the report will be written
-        current_path (string, optional): the current path being traced backwards
-    """
-    print(f"{color.GREEN}INFO{color.RESET} : searching for all instances under {search_module} where the module type contains the string '{module_type}'\n")
-    start_of_search_path = current_path # save what hierarchy you're currently on here
-    for module in verilog_modules:
-        # cycle through all sub-modules to find if a given module is found
-        for i_type, i_name in module.submodules:
-            append_path = start_of_search_path # re-initialize for each sub-module
-            if i_type.find(module_type) != -1:
-                if current_path == "":
-                    append_path = f"{i_name}"
-                else:
-                    append_path = f"{i_name}{seperating_char}{start_of_search_path}"
-
-                if module.name == search_module:
-                    print(f"INFO : Found path  = {module.name}{seperating_char}{append_path}")
-                    outfile.write(f"{module.name}{seperating_char}{append_path}\n")
-                find_all_instances(module.name, search_module, outfile, current_path=append_path)
-
-def find_all_instances_iname_re(module_name, search_module, outfile, current_path=""):
-    """recursively works backwards to find all paths to module with a certain name.
-    module_name will contain the string you're looking for in a module
-    Follows the regular find_all_instances() function after this first call.
-
-    Args:
-        module_name (string): the instance name you're looking for MUST contain this string
-        search_module (string): the module you're looking under
-        outfile (file): file where the report will be written
-        current_path (string, optional): the current path being traced backwards
-    """
-    print(f"{color.GREEN}INFO{color.RESET} : searching for all instances under {search_module} which contain the string '{module_name}'\n")
-    start_of_search_path = current_path # save what hierarchy you're currently on here
-    for module in verilog_modules:
-        # cycle through all sub-modules to find if a given module is found
-        for i_type, i_name in module.submodules:
-            append_path = start_of_search_path # re-initialize for each sub-module
-            if i_name.find(module_name) != -1:
-                if current_path == "":
-                    append_path = f"{i_name}"
-                else:
-                    append_path = f"{i_name}{seperating_char}{start_of_search_path}"
-
-                if module.name == search_module:
-                    print(f"INFO : Found path  = {module.name}{seperating_char}{append_path}")
-                    outfile.write(f"{module.name}{seperating_char}{append_path}\n")
-                find_all_instances(module.name, search_module, outfile, current_path=append_path)
-
-def readback_instance_paths(filename):
-    """see if any modules were found in the instance search by reading back the generated file to see if it's blank
-
-    Args:
-        filename (string): path to the file you want to check
-    """
-    paths_found = False
-    lines = []
-    infile = open(filename, 'r')
-
-    for line in infile:
-        lines.append(line)
-
-    infile.close()
-
-    if len(lines) >= 1:
-        if len(lines[0]) != 0:
-            paths_found = True
-
-    return paths_found
-
-def parse_file_list(filelist):
-    """read in a list of verilog files, then run parse_verilog() on those files
-
-    Args:
-        filelist (string): path to a list of verilog files (ie DUTLIB.f)
-    """
-    if os.path.isfile(filelist):
-        verilog_list_file = open(filelist, 'r')
-
-        for line in verilog_list_file:
-            verilog_file = line.strip()
-            if not verilog_file.startswith("#"):
-                if verilog_file.find("$") != -1:
-                    verilog_file = replace_env_variable(verilog_file)
-                if os.path.isfile(verilog_file):
-                    parse_verilog(verilog_file)
-                else:
-                    if debug_mode:
-                        print(f"INFO : {verilog_file} is not a file")
-    else:
-        print(f"ERROR : {filelist} is not a file")
-
-def generate_minimized_filelist(filelist):
-    """
-    read in a filelist and generate a minimized filelist using only
-    modules that are in the used_file_list, generated during in report_hierarchy()
-
-    Args:
-        filelist (string): path to a filelist
-    """
-    global unused_file_list
-
-    if os.path.isfile(filelist):
-        og_verilog_list = open(filelist, 'r')
-        minimized_verilog_list = open(f"minimized_filelist.f", 'w')
-
-        for line in og_verilog_list:
-            verilog_file = line.strip()
-            if not verilog_file.startswith("#"):
-                if verilog_file.find("$") != -1:
-                    verilog_file = replace_env_variable(verilog_file)
-                if os.path.isfile(verilog_file):
-                    if verilog_file not in unused_file_list:
-                        minimized_verilog_list.write(f"{line}")
-                elif verilog_file.startswith("+incdir+"):
-                    # write out all include-directory lines
-                    minimized_verilog_list.write(f"{line}")
-                else:
-                    if debug_mode:
-                        print(f"INFO : {verilog_file} is not a file")
-    else:
-        print(f"ERROR : {filelist} is not a file")
-
-
-def save_verilog_modules():
-    """
-    Saves the existing verilog_modules list to a verilog_modules.db file to be quickly accessed in the future
-    """
-    print(f"INFO : saving modules to verilog_modules.db ...")
-
-    # Serialize the list using pickle to store in the database
-    serialized_modules = pickle.dumps(verilog_modules)
-
-    # Connect to SQLite3 database
-    conn = sqlite3.connect('verilog_modules.db')
-
-    # Create a table to store serialized data
-    conn.execute('''CREATE TABLE IF NOT EXISTS modules
-                    (id INTEGER PRIMARY KEY,
-                    data BLOB)''')
-
-    # Insert serialized data into the database
-    conn.execute('INSERT INTO modules (data) VALUES (?)', (sqlite3.Binary(serialized_modules),))
-
-    # Commit changes and close connection
-    conn.commit()
-    conn.close()
-
-def report_multi_defined():
-    """
-    Generates STDOUT and writes out file to report all modules that are defined in multiple locations.
-
-    This is typically either two independant definitions, or reading in the same file more than once by accident.
-
-    The report will be written out to multi_defined_module_list.txt if any exist.
-
-    Returns True if no duplicates found
-    """
-    global multi_defined_list
-    global verilog_modules
-
-    if os.path.exists("multi_defined_module_list.txt"):
-        os.remove("multi_defined_module_list.txt")
-
-    if len(multi_defined_list) != 0:
-
-        multi_define_report = open("multi_defined_module_list.txt", 'w')
-
-        for module, filepath, start_line, start_col in multi_defined_list:
-            print(f"{color.YELLOW}WARNING{color.RESET} : module {module} defined at {filepath}:{start_line}:{start_col} was previously defined")
-            multi_define_report.write(f"module {module} defined in {filepath} was previously defined\n")
-            if debug_mode:
-                report_on_module(module)
-        multi_define_report.close()
-        return False
-    else:
-        print(f"{color.GREEN}INFO{color.RESET} : No modules defined more than once! :)")
-        return True
-
-def retrieve_verilog_modules():
-    """
-    Find the verilog_modules.db file and use it to overwrite the existing verilog_modules.
-    This will be faster than reading in the modules again.
-    """
-    global verilog_modules
-
-    if os.path.isfile('verilog_modules.db'):
-        if debug_mode:
-            print(f"INFO : reading in verilog_modules.db ...")
-
-        # Connect to the database
-        conn = sqlite3.connect('verilog_modules.db')
-
-        # Retrieve the serialized data from the database
-        cursor = conn.execute('SELECT data FROM modules LIMIT 1')  # Assuming only one record exists
-        serialized_data = cursor.fetchone()[0]
-
-        # Deserialize the data back into verilog_modules list
-        verilog_modules = pickle.loads(serialized_data)
-
-        # Close connection
-        conn.close()
-    else:
-        print("ERROR : verilog_modules.db does not exist")
-
-def clear_verilog_modules():
-    """
-    deletes the verilog_modules.db file as well as clearing the global verilog_modules list
-    """
-    global verilog_modules
-
-    if os.path.exists("verilog_modules.db"):
-        print(f"INFO : removing verilog_modules.db ...")
-
-        os.remove("verilog_modules.db")
-        verilog_modules = []
-
-# example script...
-if __name__ == "__main__":
-
-    start_time = time.time()
-
-    default_module = "" # optional: change the default to a module you'll report on often
-
-    parser = argparse.ArgumentParser(
-        formatter_class = CustomHelpFormatter,
-        description = example_script_help_text
-    )
-    parser.add_argument("-f", "--file",         dest = "file",          type = str,  nargs = "*",                           help = "filepath to a Verilog file(s) to run script on")
-    parser.add_argument("-F", "--filelist",     dest = "filelist",      type = str,  nargs = "?",                           help = "filepath to a list of Verilog file(s) to run script on")
-    parser.add_argument("-m", "--module",       dest = "module",        type = str,  nargs = "?", default = default_module, help = "module to analyze and generate reports on")
-    parser.add_argument("-r", "--report_hier",  dest = "report_hier",   type = str,  nargs = "?", default = default_module, help = "module to search for \'-m\' defined module under")
-    parser.add_argument("-M", "--max_depth",    dest = "max_depth",     type = int,  nargs = "?", default = 0,              help = "number of levels of hierarchy you want to analyze (0 means no limit)")
-    parser.add_argument("-u", "--print_unused", dest = "print_unused",  action='store_true',                                help = "generate list of unused modules that were read in")
-    parser.add_argument("-d", "--debug_mode",   dest = "debug_mode",    action='store_true',                                help = "enable printing of non-essential debug messages, recommend running only on single file")
-
-    args            = parser.parse_args()
-    verilog_file    = args.file
-    filelist        = str(args.filelist)
-    analyze_module  = str(args.module)
-    top_module      = str(args.report_hier)
-    max_depth       = int(args.max_depth)
-    print_unused    = args.print_unused
-    debug_mode      = args.debug_mode
-
-    # if reading in verilog files at start of script, delete the existing verilog modules first...
-    if ((verilog_file != [] and str(verilog_file) != "None") or (filelist != "None")):
-        clear_verilog_modules()
-
-    # example of reading in verilog files by passing in individual filepaths
-    if verilog_file != [] and str(verilog_file) != "None":
-        for file in verilog_file:
-            parse_verilog(file)
-
-    # example of reading in verilog files by passing in filepath to a filelist
-    if filelist != "None":
-        parse_file_list(filelist)
-
-    # example of reading in an existing database when no files passed in
-    # also good idea to read back `define variables when reading in files
-    if ((verilog_file == [] or str(verilog_file) == "None") and (filelist == "None")):
-        print(f"INFO : no file specified, using database method...")
-        retrieve_verilog_modules()
-    else:
-        save_verilog_modules()
-        report_multi_defined()
-        if debug_mode:
-            print(f"INFO : verilog_define_variables = {verilog_define_variables}")
-
-    # example of generating a report for a certain module
-    if analyze_module != "":
-        if verilog_modules == []:
-            print(f"INFO : verilog_modules is empty list, skipping reporting stage as this will just cause errors...")
-        else:
-            report_on_module(analyze_module)
-            report_hierarchy(analyze_module, report_unused=print_unused, max_depth=max_depth)
-
-            if print_unused and filelist != "None":
-                generate_minimized_filelist(filelist)
-
-            if top_module != "":
-                top_module_defined = False
-                analyze_module_defined = False
-                for modules in verilog_modules:
-                    if top_module == modules.name:
-                        top_module_defined = True
-                    if analyze_module == modules.name:
-                        analyze_module_defined = True
-
-                if top_module_defined and analyze_module_defined:
-                    out_file = open(f"{analyze_module}_under_{top_module}.txt", 'w')
-                    find_all_instances(analyze_module, top_module, out_file)
-                    # find_all_instances_re(analyze_module, top_module, out_file)
-                    # find_all_instances_iname_re(analyze_module, top_module, out_file)
-                    out_file.close()
-                    if not readback_instance_paths(f"{analyze_module}_under_{top_module}.txt"):
-                        print(f"{color.YELLOW}WARNING{color.RESET} : No instances of {analyze_module} found under {top_module}")
-                        print(f"          Removing file {analyze_module}_under_{top_module}.txt as it is blank ...")
-                        os.remove(f"{analyze_module}_under_{top_module}.txt")
-                else:
-                    print(f"{color.RED}ERROR{color.RESET} : module specified in -m and/or -r option not defined")
-                    print(f"\tError info: {analyze_module} exists? {str(analyze_module_defined)}")
-                    print(f"\tError info: {top_module} exists? {str(top_module_defined)}")
-    else:
-        print(f"INFO : no module selected for heirarchy reporting.")
-
-    end_time = time.time()
-
-    print(f"INFO : Execution time = {end_time - start_time} seconds")
-    if end_time - start_time > 60:
-        print(f"       ({math.floor((end_time - start_time) / 60)} minutes)")
+
+r"""
+Copyright (C) 2024 Analog Devices, Inc., All Rights Reserved.
+
+This module contains a library of functions designed to aide in writing Python scripts around Verilog files
+where Hierarchy knowledge is required.
+
+To use this library, it is recommended that the jerelog_parser be imported as well as the class 'VerilogModule'.
+    -This class is used as the standard format to transfer module information between functions contained in this library.
+
+This library does not require the use of a Verilog interpreter such as Icarus or Xcelium.
+
+This library contains an example script showing some basic applications of the functions contained within this library.
+"""
+
+import argparse
+import os
+import sys
+import time
+import re
+import pickle
+import gzip
+import tempfile
+import signal
+import math
+import mmap
+import functools
+import concurrent.futures
+
+# optional: zstandard compresses and decompresses the module database several
+# times faster than gzip at a similar ratio; everything works without it
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class CustomHelpFormatter(
+    argparse.RawDescriptionHelpFormatter,
+    argparse.ArgumentDefaultsHelpFormatter,
+    argparse.MetavarTypeHelpFormatter):
+    pass
+
+# help prompt, look how nice it is in Python!
+example_script_help_text = """
+INFO:
+    This script contains only a basic example of how to use functions defined
+    in this library. It is recommended that this library be imported and integrated
+    to your own scripting.
+"""
+
+class color:
+    GREY        = "\033[38;5;246m"
+    GREEN       = "\033[38;5;10m"
+    YELLOW      = "\033[38;5;220m"
+    WHITE       = "\033[38;5;255m"
+    RED         = "\033[38;5;196m"
+    RESET       = "\033[0;0m"
+    GREEN_BG    = "\033[48;5;10m\033[38;5;232m"  # bold black text on green background
+    YELLOW_BG   = "\033[48;5;220m\033[38;5;232m" # bold black text on yellow background
+    GREY_BG     = "\033[48;5;246m\033[38;5;232m" # bold black text on grey background
+    RED_BG      = "\033[48;5;196m\033[38;5;232m" # bold white text on red background
+
+class VerilogModule:
+    """
+    Custom class to hold saved attributes about a Verilog Module in
+    a format which can aide parsing throughout functions in jerelog_parser.
+
+    ATTRIBUTES:
+        name: module name
+        inputs: list of module inputs
+        outputs: list of module outputs
+        submodules: list of instances as well as their type
+
+        (useful for VS Code CTRL + Click navigation):
+        filepath: path to the file where this module is defined
+        linenum: line number on filepath where module is defined
+        startcol: column number on filepath where module is defined <points to the end of the module name>
+    """
+    # large designs hold one of these per module; slots drop the per-instance
+    # __dict__, shrinking both the resident set and the pickled database
+    __slots__ = ('name', 'inputs', 'outputs', 'submodules', 'filepath', 'linenum', 'startcol')
+
+    def __init__(self, name, inputs, outputs, submodules, filepath, linenum, startcol):
+        self.name       = name
+        self.inputs     = inputs
+        self.outputs    = outputs
+        self.submodules = submodules
+        self.filepath   = filepath
+        self.linenum    = linenum
+        self.startcol   = startcol
+
+seperating_char = "." # use this to define what character separates the hierarchies when reporting paths.
+
+debug_mode = False # importers (and __main__) override this to enable non-essential debug messages
+
+# preformatted once so hot paths don't rebuild the ANSI-colored prefix (two
+# attribute lookups plus an f-string) on every message
+_INFO_PREFIX = f"{color.GREEN}INFO{color.RESET} : "
+
+verilog_modules = []
+verilog_modules_by_name = {} # index of verilog_modules keyed by module name for O(1) lookups
+module_list = set()
+multi_defined_list = []
+used_module_list = set() # sets, since these only ever feed membership tests
+used_file_list = set()
+unused_file_list = set()
+verilog_define_variables = set()
+
+@functools.lru_cache(maxsize=None)
+def read_module_info(module_name):
+    """return information about a module if it is defined
+
+    Results are cached since hierarchy reporting asks about the same module once
+    per instance; the cache is cleared whenever the module list changes.
+
+    Args:
+        module_name (string): the name of the module you want to get information about
+
+    Returns:
+        name: module name
+        inputs: list of module inputs
+        outputs: list of module outputs
+        submodules: list of instances as well as their type
+
+        (useful for VS Code CTRL + Click navigation):
+        filepath: path to the file where this module is defined
+        linenum: line number on filepath where module is defined
+        startcol: column number on filepath where module is defined
+    """
+    module = verilog_modules_by_name.get(module_name)
+    if module is not None:
+        return {
+            "name": module.name,
+            "inputs": module.inputs,
+            "outputs": module.outputs,
+            "submodules": module.submodules,
+            "filepath": module.filepath,
+            "linenum": module.linenum,
+            "startcol": module.startcol
+        }
+
+# the two comment openers in one alternation so a single C-level scan finds
+# whichever comes first (a '//*' line naturally tokenizes as '//'); '*/' gets
+# its own pattern because it only means anything inside a block comment, and
+# searching for it separately keeps a stray '*/' from swallowing the first
+# character of an opener that starts one column later (as in 'a*/*note*/b')
+_COMMENT_RE = re.compile(r'/\*|//')
+_BLOCK_END_RE = re.compile(r'\*/')
+
+def get_uncommented(line, block_comment):
+    """pass in a line and return the section that isn't blocked by a comment
+
+    Args:
+        line (string): raw line
+        block_commment (bool): true if line starts in an active block comment
+
+    Returns:
+        out_line (string): line without the comments
+        block_comment (bool): true if line ends in an active block comment
+    """
+    parts = []
+    pos = 0
+
+    while True:
+        if block_comment:
+            match = _BLOCK_END_RE.search(line, pos)
+            if not match:
+                # the block comment runs past the end of the line
+                return "".join(parts), block_comment
+            # move past the end of the block comment and clear the flag, adding nothing
+            block_comment = False
+            pos = match.end()
+        else:
+            match = _COMMENT_RE.search(line, pos)
+            # a stray '*/' out here passes through as regular text
+            if not match:
+                # no more comments, keep the rest of the line
+                parts.append(line[pos:])
+                return "".join(parts), block_comment
+            # keep anything before the comment either way
+            parts.append(line[pos:match.start()])
+            if match.group() == "//":
+                # the rest of the line is commented out
+                return "".join(parts), block_comment
+            block_comment = True
+            pos = match.end()
+
+def check_ifdefs(line, inside_ifdef, ifdef_stack):
+    """check for valid \`ifdefs and \`defines
+
+    Args:
+        line (string): a line with no comments.
+        inside_ifdef (bool): store if the current line exists within an \`ifdef already.
+        ifdef_stack (array of strings): stack of variables being used for \`ifdefs (pop as the \`endif is detected).
+
+    Returns:
+        filtered_line: filters out the existing line if it is blocked by ifdefs.
+        inside_ifdef (bool): PASSTHROUGH store if the current line exists within an \`ifdef already.
+        ifdef_stack (array of strings): PASSTHROUGH stack of variables being used for \`ifdefs (pop as the \`endif is detected).
+    """
+
+    global verilog_define_variables
+    temp_line = line.strip()
+    filtered_line = ""
+
+    # fast path: the vast majority of lines carry no compiler directive at all,
+    # skip the token split and the directive comparisons entirely for those
+    if not temp_line.startswith('`'):
+        if inside_ifdef or len(ifdef_stack) == 0:
+            filtered_line = line
+        return filtered_line, inside_ifdef, ifdef_stack
+
+    temp_line = temp_line.replace("\t", " ")
+
+    # dispatch on the first token instead of running startswith for every known directive
+    directive = temp_line.split(' ', 1)[0]
+
+    # Check for `ifdef, `else, `define and `endif
+    if directive == '`ifdef':
+        ifdef_stack.append(temp_line.split(' ')[-1])
+        inside_ifdef = ifdef_stack[-1] in verilog_define_variables
+    elif directive == '`protected':
+        ifdef_stack.append('protected')
+        inside_ifdef = ifdef_stack[-1] in verilog_define_variables
+    elif directive == '`ifndef':
+        ifdef_stack.append(temp_line.split(' ')[-1])
+        inside_ifdef = len(ifdef_stack) == 0 and ifdef_stack[-1] not in verilog_define_variables
+    elif directive == '`endif':
+        ifdef_stack.pop()
+        inside_ifdef = len(ifdef_stack) > 0 and ifdef_stack[-1] in verilog_define_variables
+    elif directive == '`endprotected':
+        ifdef_stack.pop()
+        inside_ifdef = len(ifdef_stack) > 0 and ifdef_stack[-1] in verilog_define_variables
+    elif directive == '`else':
+        inside_ifdef = len(ifdef_stack) > 0 and ifdef_stack[-1] not in verilog_define_variables
+    elif directive == '`define':
+        if (inside_ifdef) or (len(ifdef_stack) == 0):
+            # Parse `define variables and add them to verilog_define_variables
+            tokens = temp_line.split(' ')
+            if len(tokens) >= 2:
+                verilog_define_variables.add(tokens[1])
+    else:
+        # Include the line if inside a valid `ifdef block or not inside any `ifdef
+        if inside_ifdef or len(ifdef_stack) == 0:
+            filtered_line = line
+
+    return filtered_line, inside_ifdef, ifdef_stack
+
+# the name is everything after "module " up to whitespace, '(' or ';'
+_MODULE_NAME_RE = re.compile(r'module\s+([^ \t\n(;]*)')
+
+def get_module_name(line):
+    """Reads in a line where a module is initially defined and returns the module name
+
+    Args:
+        line (string): starts with "module " and has a module name on it
+
+    Returns:
+        string: just the module name, does not return the module IO
+    """
+    name_match = _MODULE_NAME_RE.search(line)
+
+    return name_match.group(1) if name_match else ""
+
+_WS_TABLE = str.maketrans({'\n': ' ', '\t': ' '}) # whitespace normalization in one translate pass
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+
+def get_one_line_code(module_code):
+    """
+    Collapse a module's pre-normalized lines into a single line to simplify reading
+
+    Args:
+        module_code (array of strings): the module's lines, already stripped of newlines/tabs by parse_verilog
+    """
+    one_line_code = "".join(module_code)
+    one_line_code = one_line_code.replace(", ", ",")
+    one_line_code = one_line_code.replace("# (", "#(")
+
+    # skip over parameters '#(...)' and event-triggered '@(...)' if any,
+    # copying everything outside them in a single left-to-right pass
+    out_parts = []
+    pos = 0
+    while True:
+        hash_idx = one_line_code.find("#(", pos)
+        at_idx   = one_line_code.find("@(", pos)
+        if hash_idx == -1 and at_idx == -1:
+            out_parts.append(one_line_code[pos:])
+            break
+        if hash_idx == -1 or (at_idx != -1 and at_idx < hash_idx):
+            skip_idx = at_idx
+        else:
+            skip_idx = hash_idx
+        out_parts.append(one_line_code[pos:skip_idx])
+
+        # move past the matching close parenthesis
+        i = skip_idx + 2
+        parenth_lvl = 1
+        while i < len(one_line_code) and parenth_lvl != 0:
+            if one_line_code[i] == ")":
+                parenth_lvl = parenth_lvl - 1
+            if one_line_code[i] == "(":
+                parenth_lvl = parenth_lvl + 1
+            i = i + 1
+        pos = i
+
+    one_line_code = _MULTI_SPACE_RE.sub(" ", "".join(out_parts))
+
+    # debug that all whitespace other than a single space is removed
+    # print(one_line_code)
+    return one_line_code
+
+def get_module_type_name(type_name_string):
+    """parse an instance's instantiation for that instance's type and instance name
+
+    Args:
+        type_name_string (string): contains two words seperated by whitespace only
+
+    Returns:
+        type_string: instance's type
+        name_string: instance's name
+    """
+
+    type_string = ""
+    name_string = ""
+
+    # get rid of leading whitespace
+    type_name_string = type_name_string.strip()
+
+    type_string = type_name_string[:type_name_string.find(" ") + len(" ")]
+    name_string = type_name_string[type_name_string.find(" ") + len(" "):]
+
+    type_string = type_string.strip()
+    name_string = name_string.strip()
+
+    # if debug_mode:
+    #     print(f"sub-instance type = {type_string}, sub-instance name = {name_string}")
+
+    return type_string, name_string
+
+# compiled once at import rather than on every parse_ports call
+_PORT_RE = re.compile(r'\b(input|output|inout)\s+(?:reg|logic|bit)?\s*(?:(\[[^\]]*\])\s*)?(\w+(?:\s*,\s*\w+)*)\s*[;,)]', re.MULTILINE)
+_PORT_NAME_RE = re.compile(r'\w+')
+
+def parse_ports(verilog_text):
+    """get the ports of a module using regular expressions
+
+    Args:
+        verilog_text (string): pass in the single-line version of the module's code
+
+    Returns:
+        ports: a list of all ports with (in order) port direction, name, and width
+    """
+    ports = []
+
+    for match in _PORT_RE.finditer(verilog_text):
+        port_type, bit_width, port_group = match.groups()
+        bit_width_formatted = bit_width.strip() if bit_width else ''
+        # findall pulls each name out of the comma-separated group without split + strip churn
+        ports.extend((port_type, port_name, bit_width_formatted) for port_name in _PORT_NAME_RE.findall(port_group))
+
+    return ports
+
+# reserved words/characters that should not be the names of instances or modules
+invalid_module_names = [
+    'if', 'else',
+    'begin', 'end',
+    'case', 'endcase',
+    'generate', 'endgenerate',
+    'initial',
+    'wire',
+    'logic',
+    'parameter',
+    'localparam',
+    'assign',
+    'always',
+    'always_ff',
+    'for',
+    '$display',
+    '$finish',
+    '@',
+]
+
+# built once at import from invalid_module_names: a frozenset for O(1) membership
+# tests, and one alternation that strips a leading reserved word plus its trailing
+# space in a single match instead of looping over the list per candidate
+_INVALID_NAMES = frozenset(invalid_module_names)
+_RESERVED_PREFIX_RE = re.compile('(?:' + '|'.join(re.escape(w) for w in invalid_module_names) + ') ')
+
+# characters that never appear in a real instance type/name pair, caught in one scan
+_BAD_INST_CHARS = re.compile(r'[=:.\[\]$<> ]').search
+
+# drives the statement scan in save_module_attributes: module headers, statement
+# keywords worth skipping outright, instantiation-shaped "type name (" pairs, and
+# the semicolons that delimit statements, all found in one C-level pass
+_SUBMOD_SCAN = re.compile(r'\bmodule\s+\w+|\bwire\b|\bassign\b|([A-Za-z_]\w*)\s+([A-Za-z_]\w*)\s*\(|;')
+
+def _is_reserved_run(s, start, end):
+    """return True if s[start:end] contains nothing but spaces and reserved words
+
+    Used to confirm an instantiation-shaped match really sits at the start of its
+    statement, allowing for prefixes like 'end' or 'begin' in front of it.
+
+    Args:
+        s (string): string being scanned
+        start (int): start of the span to check
+        end (int): end of the span to check
+    """
+    while True:
+        while start < end and s[start] == " ":
+            start = start + 1
+        reserved = _RESERVED_PREFIX_RE.match(s, start, end)
+        if reserved is None:
+            break
+        start = reserved.end()
+    return start == end
+
+def save_module_attributes(module, one_line_module_code):
+    """retreive all information about a verilog module
+
+    Args:
+        module (string): name of the module
+        one_line_module_code (string): uncommented, single-line version of the verilog code
+
+    Returns:
+        input_list: list of all inputs to this module
+        output_list: list of all outputs to this module
+        submod_list: list of all submodules called by this module
+    """
+
+    def handle_ctrl_c(signal, frame):
+        # print("\nCtrl+C detected. Exiting gracefully...")
+        print(f"\nremaining line at exit: {one_line_module_code[stmt_start:]}")
+        exit()
+    if debug_mode:
+        print(f"{_INFO_PREFIX}getting attributes for module {module} ...")
+        signal.signal(signal.SIGINT, handle_ctrl_c)
+
+    stmt_start = 0
+    input_list = []
+    output_list = []
+    submod_list = []
+
+    ports = parse_ports(one_line_module_code)
+
+    if debug_mode:
+        print(ports)
+
+    # store the (type, name, width) entries as tuples: they are never mutated
+    # after this point, and tuples are smaller in memory and faster to pickle
+    for port in ports:
+        port_type = port[0]
+        if port_type == "input":
+            input_list.append(port)
+        if port_type == "output":
+            output_list.append(port)
+        if port_type == "inout":
+            input_list.append(port)
+            output_list.append(port)
+
+    # let the compiled tokenizer walk the flattened module in one pass; Python only
+    # runs on the interesting tokens instead of once per character/statement
+    skip_to_semi = False
+    for match in _SUBMOD_SCAN.finditer(one_line_module_code):
+        if match.group() == ";":
+            stmt_start = match.end()
+            skip_to_semi = False
+            continue
+        if skip_to_semi:
+            continue
+
+        inst_type = match.group(1)
+        if inst_type is None:
+            # a module header, wire, or assign: nothing to harvest in this statement
+            skip_to_semi = True
+            continue
+
+        inst_name = match.group(2)
+        # the pair must sit at the start of its statement (reserved prefixes like
+        # "end" or "begin" aside), otherwise it's the tail of something longer
+        if _is_reserved_run(one_line_module_code, stmt_start, match.start(1)):
+            inst_type_name_cat = inst_type + inst_name # to simplify filtering code, save type and name into a single string to check for any special characters
+            if (
+                # make sure the type or name isn't a reserved word
+                (inst_type not in _INVALID_NAMES) and
+                (inst_name not in _INVALID_NAMES) and
+
+                # neither instance name or type should have these special characters...
+                (_BAD_INST_CHARS(inst_type_name_cat) is None)
+                ):
+                submod_list.append((inst_type, inst_name))
+
+        skip_to_semi = True
+
+    if debug_mode:
+        print(f"\t{color.YELLOW}INPUTS{color.RESET}        : {input_list[:len(input_list)]}")
+        print(f"\t{color.YELLOW}OUTPUTS{color.RESET}       : {output_list[:len(output_list)]}")
+        for inst_t, inst in submod_list:
+            print(f"\t{color.GREY}CALLED MODULE{color.RESET} : instance = {inst},\ttype = {inst_t}")
+
+    return input_list, output_list, submod_list
+
+_ENV_VAR_RE = re.compile(r'\$(\w+)')
+
+@functools.lru_cache(maxsize=4096)
+def replace_env_variable(filepath):
+    """
+    Pass in a filepath with environment variables and returns the
+    same filepath with the environment varialbe replaced by that variable's value.
+
+    Results are cached since filelists tend to repeat the same few variables
+    (e.g. a shared $PROJECT_ROOT prefix) across thousands of entries.
+
+    Args:
+        filepath (string): filepath with environment variables
+
+    Returns:
+        string: filepath where the environment variables are replaced by the value
+    """
+    def expand(match):
+        env_var_value = os.environ.get(match.group(1), '')
+        if debug_mode:
+            print(f"INFO : replacing ${match.group(1)} with {env_var_value}")
+        return env_var_value
+
+    # one regex pass replaces the old find('$')/find(os.path.sep) splice loop and
+    # also handles a variable sitting at the very end of the path, which the old
+    # loop silently left unexpanded
+    return _ENV_VAR_RE.sub(expand, filepath)
+
+def parse_verilog(filename):
+    """Reads in a verilog file and saves information about the modules contained within to verilog_modules
+
+    Args:
+        filename (string): path to Verilog file intended to be parsed
+    """
+
+    # no pre-test for '$' needed: the replacement is a single cached regex
+    # pass, so calling it unconditionally is cheaper than scanning first
+    filename = replace_env_variable(filename)
+
+    if os.path.isfile(filename):
+        print(f"{_INFO_PREFIX}reading in {filename} ...")
+
+        active_module = False
+        block_comment = False
+        inside_ifdef = False
+        ifdef_stack = []
+        line_number = 0
+
+        module_code = []
+        ifdef_stack = []
+        global verilog_modules
+        global module_list
+        global multi_defined_list
+        global _parents_by_type
+        global _parents_by_iname
+
+        # the module list is about to change, any prebuilt reverse index or cached
+        # module info is stale
+        _parents_by_type = None
+        _parents_by_iname = None
+        read_module_info.cache_clear()
+
+        # memory-map the file and split lines off the mapping directly, skipping
+        # the buffered text layer's per-line copy and decode machinery
+        with open(filename, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return # nothing to parse (and mmap cannot map an empty file)
+            mapped_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # cheap pre-scan over the raw bytes: a file with no 'module' keyword and no
+        # `define cannot affect any saved state, so skip the per-line machinery
+        # (headers full of includes, lint waivers, etc. are common in big filelists)
+        if mapped_file.find(b"module") == -1 and mapped_file.find(b"`define") == -1:
+            mapped_file.close()
+            return
+
+        for raw_line in iter(mapped_file.readline, b""):
+            line_number = line_number + 1
+            line = raw_line.decode('utf-8', 'replace')
+
+            uncommented_line, block_comment = get_uncommented(line, block_comment)
+            uncommented_line, inside_ifdef, ifdef_stack = check_ifdefs(uncommented_line, inside_ifdef, ifdef_stack)
+
+            if (uncommented_line != "") or (uncommented_line != "\n"):
+
+                # debug exactly what pass through the above filters (commenting and `ifdef filters)
+                # if debug_mode:
+                #     print(uncommented_line[:len(uncommented_line) - 1])
+
+                # endmodule case
+                if "endmodule" in uncommented_line:
+                    if active_module == False:
+                        print("ERROR : endmodule detected before a 'module' definition was established")
+                        exit()
+                    if debug_mode:
+                        print(f"INFO : End of module \'{module}\' on line {str(line_number)}")
+                    active_module = False
+
+                    # module is finished here, save off the attributes and reset the module_code variable for the next module (if any);
+                    # lines are normalized (newlines/tabs to spaces) as they are appended so
+                    # get_one_line_code never re-walks the whole flattened module for them
+                    module_code.append(uncommented_line.translate(_WS_TABLE))
+                    one_line_module_code = get_one_line_code(module_code)
+                    if module not in module_list:
+                        module_list.add(module)
+                        input_list, output_list, submod_list = save_module_attributes(module, one_line_module_code)
+                        verilog_modules.append(VerilogModule(module, input_list, output_list, submod_list, filename, start_line, start_column))
+                        verilog_modules_by_name[module] = verilog_modules[-1]
+                    else:
+                        print(f"{color.YELLOW}WARNING{color.RESET} : module named {module} already defined")
+                        multi_defined_list.append([module, filename, start_line, start_column])
+                    module_code = []
+
+                # module definition case
+                elif (uncommented_line.strip().startswith("module ")) or (uncommented_line.strip().startswith("module\t")) or (" module " in uncommented_line):
+                    module = get_module_name(uncommented_line)
+                    start_line = line_number
+                    start_column = uncommented_line.find(module) + len(module) + 1
+                    if debug_mode:
+                        print(f"INFO : Reading in module \'{module}\' on line {str(line_number)}")
+                    active_module = True
+                    module_code.append(uncommented_line.translate(_WS_TABLE))
+
+                # between a 'module' and an 'endmodule'
+                elif active_module:
+                    module_code.append(uncommented_line.translate(_WS_TABLE))
+
+        mapped_file.close()
+
+        if active_module:
+            print(f"{color.RED}ERROR{color.RESET} : module \'{module}\' did not have a corresponding endmodule")
+            exit()
+    else:
+        print(f"ERROR : {filename} was not found")
+
+def report_on_module(module):
+    """print all saved information for a given module
+
+    Args:
+        module (string): this should be the module name (note, NOT the instance name)
+    """
+
+    top_module_info = read_module_info(module)
+
+    print("\n-------------------------------------")
+    print(f"INFO : report on module {module}...")
+    if top_module_info:
+        print(f"NAME:       {top_module_info['name']}")
+        print(f"FILEPATH:   {top_module_info['filepath']}:{top_module_info['linenum']}:{top_module_info['startcol']}")
+        print(f"INPUTS:     {top_module_info['inputs']}")
+        print(f"OUTPUTS:    {top_module_info['outputs']}")
+        print(f"INSTANCE:   {top_module_info['submodules']}")
+    else:
+        print(f"{color.RED}ERROR{color.RESET} : module {module} was not found.")
+    print("-------------------------------------\n")
+
+def report_hierarchy(top_module, hier_num=0, report_unused=False, max_depth=0):
+    """This function walks the module information and prints out a hierarchical tree.
+
+    Args:
+        top_module (string): pass in module to report hierarchy on
+        hier_num (int, optional): hierarchy depth to start the indentation at. Default to 0.
+        report_unused (bool, optional): reports if any modules are read in but unused. Defaults to False.
+        max_depth (int, optional): if NOT set to 0, sets the number of levels below top_module you want to report.
+    """
+    global used_module_list # keep a running list of all modules used
+    global used_file_list   # keep a running list of all files used
+    global unused_file_list # keep a running list of all files used
+
+    if report_unused:
+        used_module_list = {top_module}
+
+    # collect both reports in memory and write each with a single call at the
+    # end, instead of one print and one out_file.write per line of hierarchy
+    print_lines = [f"\nINFO : reporting hierarchy below module {top_module}...\n\n", top_module + "\n"]
+    file_lines  = []
+    if max_depth != 0:
+        file_lines.append(f"INFO : max_depth set to {max_depth}\n\n")
+    file_lines.append(top_module + "\n")
+
+    # walk the tree with an explicit stack rather than recursion, so deep
+    # hierarchies cannot hit the interpreter recursion limit and we skip the
+    # per-level function call overhead; entries are (module type, instance
+    # name, depth), with instance name None for the top module itself, and
+    # children are pushed in reverse so they pop in declaration order
+    visit_stack = [(top_module, None, hier_num)]
+    while visit_stack:
+        module_name, instance_name, depth = visit_stack.pop()
+
+        if instance_name is not None:
+            indent      = '| ' * depth
+            file_indent = '\t' * depth
+            print_lines.append(f"{indent}{instance_name} ({module_name})\n")
+            file_lines.append(f"{file_indent}{instance_name} ({module_name})\n")
+            used_module_list.add(module_name)
+            if max_depth != 0 and depth >= max_depth:
+                continue
+
+        module_info = read_module_info(module_name)
+        if module_info:
+            used_file_list.add(module_info['filepath'])
+            for i_type, i_name in reversed(module_info['submodules']):
+                visit_stack.append((i_type, i_name, depth + 1))
+
+    print("".join(print_lines), end='')
+    # binary mode skips the text-encoding layer; module and instance names are
+    # plain Verilog identifiers so a straight ascii encode of the joined report
+    # lands in one write
+    out_file = open("hierarchy_" + top_module + ".txt", 'wb', buffering=1<<20)
+    out_file.write("".join(file_lines).encode('ascii'))
+    out_file.close()
+
+    if report_unused:
+        print(f"\nINFO : generating report of unused modules under {top_module}...")
+        unique_unused_module_list = []
+
+        # report all unused modules over STDOUT
+        for module in verilog_modules:
+            if module.name not in used_module_list:
+                unique_unused_module_list.append(module)
+                print(f"\tmodule type {module.name} was unused ({module.filepath}:{module.linenum}:{module.startcol})")
+
+        # report all unused files in unused_files.txt
+        unused_log_file = open("unused_files.txt", 'w')
+        for module in unique_unused_module_list:
+            if (module.filepath not in unused_file_list) and (module.filepath not in used_file_list):
+                unused_file_list.add(module.filepath)
+                unused_log_file.write(f"No modules from this file were used : {module.filepath}\n")
+        unused_log_file.close()
+
+    print(f"\nINFO : end of hierarchy report")
+
+# lazy reverse indexes over the submodule graph, rebuilt on demand after the
+# module list changes:
+#   _parents_by_type: child module type -> list of (parent module name, instance name)
+#   _parents_by_iname: instance name -> list of parent module names
+# entries are in module/submodule declaration order so walks report paths in
+# the same order the old full-list scan did
+_parents_by_type = None
+_parents_by_iname = None
+
+def _build_reverse_indexes(modules):
+    """build reverse indexes over the submodule graph of the given module list
+
+    Args:
+        modules (list of VerilogModule): modules to index
+
+    Returns:
+        parents_by_type: dict of child module type -> list of (parent module name, instance name)
+        parents_by_iname: dict of instance name -> list of (parent module name, instance name)
+    """
+    # both indexes share the (parent, instance) value shape so the search
+    # functions can walk either one through the same code path
+    parents_by_type = {}
+    parents_by_iname = {}
+    for module in modules:
+        for i_type, i_name in module.submodules:
+            entry = (module.name, i_name)
+            parents_by_type.setdefault(i_type, []).append(entry)
+            parents_by_iname.setdefault(i_name, []).append(entry)
+    return parents_by_type, parents_by_iname
+
+def _build_parents_index():
+    """build the cached reverse indexes over the global verilog_modules list"""
+    global _parents_by_type
+    global _parents_by_iname
+
+    _parents_by_type, _parents_by_iname = _build_reverse_indexes(verilog_modules)
+
+def _resolve_indexes(modules):
+    """return (parents_by_type, parents_by_iname) for the given module list, or the cached global indexes when modules is None"""
+    if modules is None:
+        if _parents_by_type is None:
+            _build_parents_index()
+        return _parents_by_type, _parents_by_iname
+    return _build_reverse_indexes(modules)
+
+def _collect_instance_paths(module_type, search_module, current_path="", unique_ancestors=False, parents_by_type=None):
+    """return the report lines for every path from search_module down to an instance of module_type
+
+    Args:
+        module_type (string): the module you're looking for
+        search_module (string): the module you're looking under
+        current_path (string, optional): the current path being traced backwards
+        unique_ancestors (bool, optional): only report one path per distinct ancestor module instead of every path
+        parents_by_type (dict, optional): prebuilt reverse index to walk. Defaults to the cached global one.
+
+    Returns:
+        found_paths: list of newline-terminated path strings, in declaration order
+    """
+    # binding the index to a local also turns the dict lookups in the walk
+    # below into LOAD_FAST instead of module-global loads
+    if parents_by_type is None:
+        parents_by_type, _ = _resolve_indexes(None)
+
+    if unique_ancestors:
+        # prune the walk with a visited set: each module is expanded at most
+        # once, so the result is one representative path per distinct ancestor
+        # rather than every path (useful when a module is stamped out thousands
+        # of times and you only need to know where it sits, not every route)
+        visited = set()
+        found_paths = []
+        walk_stack = []
+        for parent_name, i_name in reversed(parents_by_type.get(module_type, ())):
+            if current_path == "":
+                walk_stack.append((parent_name, i_name))
+            else:
+                walk_stack.append((parent_name, f"{i_name}{seperating_char}{current_path}"))
+        while walk_stack:
+            module_name, append_path = walk_stack.pop()
+            if module_name in visited:
+                continue
+            visited.add(module_name)
+            if module_name == search_module:
+                found_paths.append(f"{module_name}{seperating_char}{append_path}\n")
+            for parent_name, i_name in reversed(parents_by_type.get(module_name, ())):
+                walk_stack.append((parent_name, f"{i_name}{seperating_char}{append_path}"))
+        return found_paths
+
+    # per-query memo of the instance-name chains leading from search_module down
+    # to each visited module: a module instantiated from many places is expanded
+    # once and its chains reused, so diamond-shaped hierarchies no longer re-walk
+    # the same ancestry per instantiation site
+    #
+    # chains are tuples of instance names rather than pre-joined strings, so
+    # extending a memoized chain copies a few pointers instead of rebuilding a
+    # progressively longer path string; the join happens once per reported path
+    chains_to = {}
+
+    def _paths_up(node):
+        """return every chain of instance names from search_module down to an instance of node"""
+        chains = chains_to.get(node)
+        if chains is not None:
+            return chains
+        chains = [()] if node == search_module else []
+        for parent_name, i_name in parents_by_type.get(node, ()):
+            for chain in _paths_up(parent_name):
+                chains.append(chain + (i_name,))
+        chains_to[node] = chains
+        return chains
+
+    found_paths = []
+    for parent_name, i_name in parents_by_type.get(module_type, ()):
+        for chain in _paths_up(parent_name):
+            path_parts = (search_module,) + chain + (i_name,)
+            if current_path != "":
+                path_parts = path_parts + (current_path,)
+            found_paths.append(seperating_char.join(path_parts) + "\n")
+
+    return found_paths
+
+def find_all_instances(module_type, search_module, outfile, current_path="", unique_ancestors=False, modules=None):
+    """works backwards to find all paths to a certain type of module
+
+    Args:
+        module_type (string): the module you're looking for
+        search_module (string): the module you're looking under
+        outfile (file): file where the report will be written
+        current_path (string, optional): the current path being traced backwards
+        unique_ancestors (bool, optional): only report one path per distinct ancestor module, pruning
+            re-entry into shared parents. Defaults to False (report every path).
+        modules (list of VerilogModule, optional): module list to search over. Defaults to the global verilog_modules.
+    """
+    if current_path == "":
+        print(f"{_INFO_PREFIX}searching for all instances under {search_module} where the module type is '{module_type}'\n")
+
+    parents_by_type, _ = _resolve_indexes(modules)
+
+    # batch the found paths into one writelines call; the per-path stdout echo
+    # is debug-only now, since printing millions of lines to a tty dominates
+    # runtime on large hierarchies
+    found_paths = _collect_instance_paths(module_type, search_module, current_path, unique_ancestors, parents_by_type)
+    outfile.writelines(found_paths)
+    if debug_mode and found_paths:
+        sys.stdout.write("".join([f"INFO : Found path:  = {found_path}" for found_path in found_paths]))
+
+def _compile_needle(needle):
+    """normalize a "contains" needle to a display string plus a match predicate
+
+    Args:
+        needle (string or re.Pattern): plain substring or pre-compiled pattern
+
+    Returns:
+        needle_text: string to show in the search banner
+        matches: callable applied to each candidate name
+    """
+    if isinstance(needle, re.Pattern):
+        return needle.pattern, needle.search
+    return needle, lambda name: needle in name
+
+def _find_instances_in_index(attr_index, matches, search_module, outfile, current_path, parents_by_type):
+    """walk one reverse index and report every hierarchy path whose key matches.
+    Shared core of find_all_instances_re and find_all_instances_iname_re; the
+    two only differ in which index (module type vs instance name) they hand in.
+
+    Args:
+        attr_index (dict): reverse index of matched attribute -> list of (parent module name, instance name)
+        matches (callable): predicate run once per distinct index key
+        search_module (string): the module you're looking under
+        outfile (file): file where the report will be written
+        current_path (string): the current path being traced backwards
+        parents_by_type (dict): type-keyed reverse index used for the upward walk
+    """
+    start_of_search_path = current_path # save what hierarchy you're currently on here
+
+    # run the "contains" filter once over the distinct index keys, then walk
+    # the reverse index per matching key instead of re-testing every submodule
+    # of every module; results come out grouped by key rather than interleaved
+    # in module declaration order
+    found_paths = []
+    log_lines = []
+    for key in attr_index:
+        if matches(key):
+            for parent_name, i_name in attr_index[key]:
+                if current_path == "":
+                    append_path = f"{i_name}"
+                else:
+                    append_path = f"{i_name}{seperating_char}{start_of_search_path}"
+
+                if parent_name == search_module:
+                    found_paths.append(f"{parent_name}{seperating_char}{append_path}\n")
+                    if debug_mode:
+                        log_lines.append(f"INFO : Found path  = {found_paths[-1]}")
+                sub_paths = _collect_instance_paths(parent_name, search_module, append_path, parents_by_type=parents_by_type)
+                found_paths.extend(sub_paths)
+                if debug_mode:
+                    log_lines.extend(f"INFO : Found path:  = {sub_path}" for sub_path in sub_paths)
+
+    # one writelines (and, in debug mode, one stdout write) instead of a pair of
+    # small writes per path found
+    outfile.writelines(found_paths)
+    if debug_mode and log_lines:
+        sys.stdout.write("".join(log_lines))
+
+def find_all_instances_re(module_type, search_module, outfile, current_path="", modules=None):
+    """recursively works backwards to find all paths to a certain type of module.
+    module_type will contain the string you're looking for in a module
+    Follows the regular find_all_instances() function after this first call.
+
+    Args:
+        module_type (string or re.Pattern): the module you're looking for MUST contain this string (pre-compiled patterns avoid re-scanning per node)
+        search_module (string): the module you're looking under
+        outfile (file): file where the report will be written
+        current_path (string, optional): the current path being traced backwards
+        modules (list of VerilogModule, optional): module list to search over. Defaults to the global verilog_modules.
+    """
+    needle_text, type_matches = _compile_needle(module_type)
+    print(f"{_INFO_PREFIX}searching for all instances under {search_module} where the module type contains the string '{needle_text}'\n")
+
+    parents_by_type, _ = _resolve_indexes(modules)
+    _find_instances_in_index(parents_by_type, type_matches, search_module, outfile, current_path, parents_by_type)
+
+def find_all_instances_iname_re(module_name, search_module, outfile, current_path="", modules=None):
+    """recursively works backwards to find all paths to module with a certain name.
+    module_name will contain the string you're looking for in a module
+    Follows the regular find_all_instances() function after this first call.
+
+    Args:
+        module_name (string or re.Pattern): the instance name you're looking for MUST contain this string (pre-compiled patterns avoid re-scanning per node)
+        search_module (string): the module you're looking under
+        outfile (file): file where the report will be written
+        current_path (string, optional): the current path being traced backwards
+        modules (list of VerilogModule, optional): module list to search over. Defaults to the global verilog_modules.
+    """
+    needle_text, name_matches = _compile_needle(module_name)
+    print(f"{_INFO_PREFIX}searching for all instances under {search_module} which contain the string '{needle_text}'\n")
+
+    parents_by_type, parents_by_iname = _resolve_indexes(modules)
+    _find_instances_in_index(parents_by_iname, name_matches, search_module, outfile, current_path, parents_by_type)
+
+def readback_instance_paths(filename):
+    """see if any modules were found in the instance search by checking whether the generated file is blank
+
+    Args:
+        filename (string): path to the file you want to check
+    """
+    # a single stat answers "is the file non-empty" without reading a
+    # potentially multi-million-line report back into memory
+    try:
+        return os.path.getsize(filename) > 0
+    except OSError:
+        return False
+
+def _parse_verilog_worker(filename):
+    """parse one file in a worker process and hand its results back to the parent
+
+    Worker processes are reused across files, so the parsing globals are reset
+    before each file; duplicate detection across files happens in the parent
+    during the merge, not here.
+
+    Args:
+        filename (string): path to Verilog file intended to be parsed
+
+    Returns:
+        tuple: (modules parsed from this file, modules multi-defined within this file, \\`define variables seen in this file)
+    """
+    global verilog_modules
+    global module_list
+    global multi_defined_list
+
+    verilog_modules = []
+    verilog_modules_by_name.clear()
+    module_list = set()
+    multi_defined_list = []
+    verilog_define_variables.clear()
+
+    parse_verilog(filename)
+
+    return verilog_modules, multi_defined_list, set(verilog_define_variables)
+
+def parse_file_list(filelist, jobs=None):
+    """read in a list of verilog files, then run parse_verilog() on those files
+
+    With jobs greater than 1 the files are parsed by a pool of worker
+    processes and merged back in filelist order, so the resulting module list,
+    duplicate warnings, and multi_defined_list match a serial run. Note that
+    \\`define variables only apply within their own file when parsing in
+    parallel; filelists that rely on a \\`define from an earlier file taking
+    effect in a later one must be parsed serially. Workers parse with
+    debug_mode at its module default (False) unless the start method copies
+    the parent's globals, so parse debug output stays off in parallel runs.
+
+    Args:
+        filelist (string): path to a list of verilog files (ie DUTLIB.f)
+        jobs (int, optional): number of parser processes to use. Defaults to None (parse serially).
+    """
+    if not os.path.isfile(filelist):
+        print(f"ERROR : {filelist} is not a file")
+        return
+
+    candidate_files = []
+    with open(filelist, 'r') as verilog_list_file:
+        for line in verilog_list_file:
+            verilog_file = line.strip()
+            if not verilog_file.startswith("#"):
+                candidate_files.append(replace_env_variable(verilog_file))
+
+    # batch the existence checks: filelists tend to point thousands of entries
+    # into a handful of library directories, so one scandir per directory
+    # replaces one stat syscall per entry
+    files_in_dir = {}
+    verilog_file_queue = []
+    for verilog_file in candidate_files:
+        parent_dir = os.path.dirname(verilog_file) or '.'
+        existing_files = files_in_dir.get(parent_dir)
+        if existing_files is None:
+            try:
+                with os.scandir(parent_dir) as dir_entries:
+                    existing_files = {entry.name for entry in dir_entries if entry.is_file()}
+            except OSError:
+                existing_files = set() # unreadable/missing directory, nothing in it can be parsed
+            files_in_dir[parent_dir] = existing_files
+        if os.path.basename(verilog_file) in existing_files:
+            verilog_file_queue.append(verilog_file)
+        else:
+            if debug_mode:
+                print(f"INFO : {verilog_file} is not a file")
+
+    if jobs is None or jobs <= 1:
+        for verilog_file in verilog_file_queue:
+            parse_verilog(verilog_file)
+        return
+
+    global verilog_modules
+    global _parents_by_type
+    global _parents_by_iname
+
+    # the module list is about to change, any prebuilt reverse index or cached
+    # module info is stale (parse_verilog handles this itself in the serial path)
+    _parents_by_type = None
+    _parents_by_iname = None
+    read_module_info.cache_clear()
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        # map() yields results in submission order, so the merge below sees the
+        # files in the same order a serial run would parse them
+        for file_modules, file_multi_defined, file_defines in executor.map(_parse_verilog_worker, verilog_file_queue, chunksize=8):
+            multi_defined_list.extend(file_multi_defined)
+            for parsed_module in file_modules:
+                if parsed_module.name not in module_list:
+                    module_list.add(parsed_module.name)
+                    verilog_modules.append(parsed_module)
+                    verilog_modules_by_name[parsed_module.name] = parsed_module
+                else:
+                    print(f"{color.YELLOW}WARNING{color.RESET} : module named {parsed_module.name} already defined")
+                    multi_defined_list.append([parsed_module.name, parsed_module.filepath, parsed_module.linenum, parsed_module.startcol])
+            verilog_define_variables.update(file_defines)
+
+def generate_minimized_filelist(filelist, unused_files=None):
+    """
+    read in a filelist and generate a minimized filelist using only
+    modules that are in the used_file_list, generated during in report_hierarchy()
+
+    Args:
+        filelist (string): path to a filelist
+        unused_files (set of strings, optional): files to drop from the filelist. Defaults to the global unused_file_list.
+    """
+    if unused_files is None:
+        unused_files = unused_file_list
+
+    if os.path.isfile(filelist):
+        # a large write buffer batches the line-by-line copies, and the with
+        # block guarantees the minimized list is flushed and closed before any
+        # caller tries to use it
+        with open(filelist, 'r') as og_verilog_list, \
+             open(f"minimized_filelist.f", 'w', buffering=1<<20) as minimized_verilog_list:
+
+            for line in og_verilog_list:
+                verilog_file = line.strip()
+                if not verilog_file.startswith("#"):
+                    verilog_file = replace_env_variable(verilog_file)
+                    if os.path.isfile(verilog_file):
+                        if verilog_file not in unused_files:
+                            minimized_verilog_list.write(f"{line}")
+                    elif verilog_file.startswith("+incdir+"):
+                        # write out all include-directory lines
+                        minimized_verilog_list.write(f"{line}")
+                    else:
+                        if debug_mode:
+                            print(f"INFO : {verilog_file} is not a file")
+    else:
+        print(f"ERROR : {filelist} is not a file")
+
+
+def save_verilog_modules():
+    """
+    Saves the existing verilog_modules list to a verilog_modules.db file to be quickly accessed in the future
+    """
+    print(f"INFO : saving modules to verilog_modules.db ...")
+
+    # stream the pickle through the gzip compressor straight to disk instead of
+    # materializing the whole serialized blob first: peak memory drops from
+    # roughly twice the pickle size to just the module list itself
+    # (protocol 5 serializes and deserializes much faster than the default, and
+    # even the fastest gzip level shrinks the repetitive blob several-fold)
+    #
+    # the write goes to a temp file in the same directory which is atomically
+    # swapped in at the end, so an interrupted save (ctrl-c, crash, full disk)
+    # never leaves a truncated verilog_modules.db for the next run to choke on
+    with tempfile.NamedTemporaryFile(dir='.', prefix='verilog_modules.db.', delete=False) as raw_file:
+        temp_db_name = raw_file.name
+        if zstandard is not None:
+            with zstandard.ZstdCompressor(level=1).stream_writer(raw_file, closefd=False) as db_file:
+                pickle.dump(verilog_modules, db_file, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            with gzip.GzipFile(fileobj=raw_file, mode='wb', compresslevel=1) as db_file:
+                pickle.dump(verilog_modules, db_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_db_name, 'verilog_modules.db')
+
+def report_multi_defined():
+    """
+    Generates STDOUT and writes out file to report all modules that are defined in multiple locations.
+
+    This is typically either two independant definitions, or reading in the same file more than once by accident.
+
+    The report will be written out to multi_defined_module_list.txt if any exist.
+
+    Returns True if no duplicates found
+    """
+    global multi_defined_list
+    global verilog_modules
+
+    if os.path.exists("multi_defined_module_list.txt"):
+        os.remove("multi_defined_module_list.txt")
+
+    if len(multi_defined_list) != 0:
+
+        multi_define_report = open("multi_defined_module_list.txt", 'w')
+
+        for module, filepath, start_line, start_col in multi_defined_list:
+            print(f"{color.YELLOW}WARNING{color.RESET} : module {module} defined at {filepath}:{start_line}:{start_col} was previously defined")
+            multi_define_report.write(f"module {module} defined in {filepath} was previously defined\n")
+            if debug_mode:
+                report_on_module(module)
+        multi_define_report.close()
+        return False
+    else:
+        print(f"{_INFO_PREFIX}No modules defined more than once! :)")
+        return True
+
+def retrieve_verilog_modules():
+    """
+    Find the verilog_modules.db file and use it to overwrite the existing verilog_modules.
+    This will be faster than reading in the modules again.
+
+    Raises FileNotFoundError if verilog_modules.db does not exist, so callers
+    can handle the missing-database case without a redundant stat of their own.
+    """
+    global verilog_modules
+
+    if not os.path.isfile('verilog_modules.db'):
+        raise FileNotFoundError("verilog_modules.db does not exist")
+
+    if debug_mode:
+        print(f"INFO : reading in verilog_modules.db ...")
+
+    # the database is a compressed pickle of the module list; stream it back
+    # through the decompressor rather than holding both the compressed and
+    # decompressed blobs in memory at once
+    # (the magic bytes say which compressor wrote the file, so a database
+    # saved with zstandard still loads on a machine that only has gzip and
+    # vice versa; databases from the old sqlite-wrapped format must be
+    # regenerated, and get a clear message instead of a pickle traceback)
+    with open('verilog_modules.db', 'rb', buffering=1<<20) as raw_file:
+        magic = raw_file.peek(16)[:16]
+        if magic.startswith(b'SQLite format 3'):
+            raise RuntimeError("verilog_modules.db is in the old sqlite format, re-parse your filelist to regenerate it")
+        if magic[:4] == b'\x28\xb5\x2f\xfd':
+            if zstandard is None:
+                raise RuntimeError("verilog_modules.db is zstandard-compressed but the zstandard package is not installed")
+            with zstandard.ZstdDecompressor().stream_reader(raw_file) as db_file:
+                verilog_modules = pickle.load(db_file)
+        elif magic[:2] == b'\x1f\x8b':
+            with gzip.GzipFile(fileobj=raw_file, mode='rb') as db_file:
+                verilog_modules = pickle.load(db_file)
+        else:
+            verilog_modules = pickle.load(raw_file)
+
+    # rebuild the by-name index to match the freshly-loaded module list
+    # (the reverse-parents indexes rebuild lazily on the next search)
+    global _parents_by_type
+    global _parents_by_iname
+    _parents_by_type = None
+    _parents_by_iname = None
+    read_module_info.cache_clear()
+    verilog_modules_by_name.clear()
+    for module in verilog_modules:
+        verilog_modules_by_name[module.name] = module
+
+def clear_verilog_modules():
+    """
+    deletes the verilog_modules.db file as well as clearing the global verilog_modules list
+    """
+    global verilog_modules
+    global _parents_by_type
+    global _parents_by_iname
+
+    if os.path.exists("verilog_modules.db"):
+        print(f"INFO : removing verilog_modules.db ...")
+
+        os.remove("verilog_modules.db")
+        verilog_modules = []
+        verilog_modules_by_name.clear()
+        _parents_by_type = None
+        _parents_by_iname = None
+        read_module_info.cache_clear()
+
+# example script...
+if __name__ == "__main__":
+
+    start_time = time.time()
+
+    default_module = "" # optional: change the default to a module you'll report on often
+
+    parser = argparse.ArgumentParser(
+        formatter_class = CustomHelpFormatter,
+        description = example_script_help_text
+    )
+    parser.add_argument("-f", "--file",         dest = "file",          type = str,  nargs = "*",                           help = "filepath to a Verilog file(s) to run script on")
+    parser.add_argument("-F", "--filelist",     dest = "filelist",      type = str,  nargs = "?",                           help = "filepath to a list of Verilog file(s) to run script on")
+    parser.add_argument("-m", "--module",       dest = "module",        type = str,  nargs = "?", default = default_module, help = "module to analyze and generate reports on")
+    parser.add_argument("-r", "--report_hier",  dest = "report_hier",   type = str,  nargs = "?", default = default_module, help = "module to search for \'-m\' defined module under")
+    parser.add_argument("-M", "--max_depth",    dest = "max_depth",     type = int,  nargs = "?", default = 0,              help = "number of levels of hierarchy you want to analyze (0 means no limit)")
+    parser.add_argument("-j", "--jobs",         dest = "jobs",          type = int,  nargs = "?", default = 1,              help = "number of parser processes for filelist parsing (1 means serial)")
+    parser.add_argument("-u", "--print_unused", dest = "print_unused",  action='store_true',                                help = "generate list of unused modules that were read in")
+    parser.add_argument("-d", "--debug_mode",   dest = "debug_mode",    action='store_true',                                help = "enable printing of non-essential debug messages, recommend running only on single file")
+
+    args            = parser.parse_args()
+    verilog_file    = args.file
+    filelist        = str(args.filelist)
+    analyze_module  = str(args.module)
+    top_module      = str(args.report_hier)
+    max_depth       = int(args.max_depth)
+    print_unused    = args.print_unused
+    debug_mode      = args.debug_mode
+
+    # if reading in verilog files at start of script, delete the existing verilog modules first...
+    if ((verilog_file != [] and str(verilog_file) != "None") or (filelist != "None")):
+        clear_verilog_modules()
+
+    # example of reading in verilog files by passing in individual filepaths
+    if verilog_file != [] and str(verilog_file) != "None":
+        for file in verilog_file:
+            parse_verilog(file)
+
+    # example of reading in verilog files by passing in filepath to a filelist
+    if filelist != "None":
+        parse_file_list(filelist, jobs=args.jobs)
+
+    # example of reading in an existing database when no files passed in
+    # also good idea to read back `define variables when reading in files
+    if ((verilog_file == [] or str(verilog_file) == "None") and (filelist == "None")):
+        print(f"INFO : no file specified, using database method...")
+        try:
+            retrieve_verilog_modules()
+        except FileNotFoundError:
+            print("ERROR : verilog_modules.db does not exist")
+    else:
+        save_verilog_modules()
+        report_multi_defined()
+        if debug_mode:
+            print(f"INFO : verilog_define_variables = {verilog_define_variables}")
+
+    # example of generating a report for a certain module
+    if analyze_module != "":
+        if verilog_modules == []:
+            print(f"INFO : verilog_modules is empty list, skipping reporting stage as this will just cause errors...")
+        else:
+            report_on_module(analyze_module)
+            report_hierarchy(analyze_module, report_unused=print_unused, max_depth=max_depth)
+
+            if print_unused and filelist != "None":
+                generate_minimized_filelist(filelist)
+
+            if top_module != "":
+                # the by-name index answers "is this module defined" directly,
+                # no need to scan the whole module list
+                top_module_defined     = top_module in verilog_modules_by_name
+                analyze_module_defined = analyze_module in verilog_modules_by_name
+
+                if top_module_defined and analyze_module_defined:
+                    out_file = open(f"{analyze_module}_under_{top_module}.txt", 'w')
+                    find_all_instances(analyze_module, top_module, out_file)
+                    # find_all_instances_re(analyze_module, top_module, out_file)
+                    # find_all_instances_iname_re(analyze_module, top_module, out_file)
+                    out_file.close()
+                    if not readback_instance_paths(f"{analyze_module}_under_{top_module}.txt"):
+                        print(f"{color.YELLOW}WARNING{color.RESET} : No instances of {analyze_module} found under {top_module}")
+                        print(f"          Removing file {analyze_module}_under_{top_module}.txt as it is blank ...")
+                        os.remove(f"{analyze_module}_under_{top_module}.txt")
+                else:
+                    print(f"{color.RED}ERROR{color.RESET} : module specified in -m and/or -r option not defined")
+                    print(f"\tError info: {analyze_module} exists? {str(analyze_module_defined)}")
+                    print(f"\tError info: {top_module} exists? {str(top_module_defined)}")
+    else:
+        print(f"INFO : no module selected for heirarchy reporting.")
+
+    end_time = time.time()
+
+    print(f"INFO : Execution time = {end_time - start_time} seconds")
+    if end_time - start_time > 60:
+        print(f"       ({math.floor((end_time - start_time) / 60)} minutes)")
@@ -0,0 +1,18 @@
+#!/bin/bash
+# Run the instance-search example under PyPy when available.
+#
+# The hierarchy walking in jerelog_parser is pure-Python recursion, which is
+# exactly the workload PyPy's JIT speeds up. The library only uses the
+# standard library (pickle/gzip/re), so no extra packages are needed:
+# any pypy3 on PATH can run it directly.
+#
+# Usage: ./run_pypy.sh <same arguments as jerelog_inst_search_example.py>
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+
+if command -v pypy3 > /dev/null 2>&1; then
+    exec pypy3 "$SCRIPT_DIR/jerelog_inst_search_example.py" "$@"
+else
+    echo "WARNING : pypy3 not found on PATH, falling back to python3"
+    exec python3 "$SCRIPT_DIR/jerelog_inst_search_example.py" "$@"
+fi